@@ -1,61 +1,85 @@
-# algorithms/a_star.py
-from utils.node import Node
-from utils.move import get_neighbors
-from utils.priority_queue import PriorityQueue
+from utils.node import NodeArena
+from utils.move import get_move_table
+from utils.priority_queue import OPEN_LISTS
+from utils.heuristics import make_heuristic, is_consistent
+from utils.state import blank_index
+from utils.closed_set import CostMap, make_closed_set
 import time
 
-def manhattan_distance(state, goal_state, size):
-    distance = 0
-    for num in range(1, size * size):
-        curr_index = state.index(num)
-        goal_index = goal_state.index(num)
-        curr_x, curr_y = divmod(curr_index, size)
-        goal_x, goal_y = divmod(goal_index, size)
-        distance += abs(curr_x - goal_x) + abs(curr_y - goal_y)
-    return distance
-
-def solve(initial_state, goal_state, size, heuristic='Manhattan'):
+def solve(initial_state, goal_state, size, heuristic='manhattan', open_list="heap", closed_set="auto", budget=None):
+    """A* search; optimal with any admissible heuristic.
+
+    With a consistent heuristic a state is closed when first generated and only
+    its open entry can still improve. Otherwise a cheaper path can reach a state
+    after it was expanded, so every state keeps its best g in a CostMap (in place
+    of the closed_set backend) and is reopened when that improves.
+    """
     start_time = time.perf_counter()
-    visited = set()
-    pq = PriorityQueue()
+    moves = get_move_table(size)
+    pq = OPEN_LISTS[open_list]()
+    estimator = make_heuristic(heuristic, goal_state, size)
+    reopen = not is_consistent(estimator)
+    visited = CostMap() if reopen else make_closed_set(size, closed_set)
+
+    nodes = NodeArena(size)
 
-    h = manhattan_distance(initial_state, goal_state, size)
-    root = Node(initial_state, cost=h)
-    pq.put(root, h)
-    visited.add(tuple(initial_state))
+    h = estimator.estimate(initial_state)
+    root = nodes.add(initial_state, blank_index(initial_state, size), h=h)
+    pq.add(initial_state, root, h)
+    if reopen:
+        visited[initial_state] = 0
+    else:
+        visited.add(initial_state)
 
-    max_frontier_size = 1
     nodes_expanded = 0
+    lower_bound = h  # Largest f popped so far
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(pq), "f_bound": lower_bound})
 
-    while not pq.empty():
-        node = pq.get()
+    while pq:
+        if budget is not None and budget.exhausted(nodes_expanded):
+            # Each f popped was the open list's smallest, and some open node on an optimal path
+            # holds its best g, so none exceeds the optimal cost
+            return budget.result(start_time, nodes_expanded, visited.nbytes() + nodes.nbytes(),
+                                 lower_bound=lower_bound, frontier_size=len(pq))
+        node, f = pq.pop()
+        if f > lower_bound:
+            lower_bound = f
+        state, blank = nodes.state[node], nodes.blank[node]
         nodes_expanded += 1
 
-        if node.state == goal_state:
+        if state == goal_state:
+            path = nodes.extract_path(node)
             return {
                 "status": "Path found",
-                "solution_path": node.extract_path(),
-                "solution_length": len(node.extract_path()),
+                "solution_path": path,
+                "solution_length": len(path),
                 "time_taken": round(time.perf_counter() - start_time, 6),
-                "space_used": max(max_frontier_size, len(visited)),
+                "space_used": visited.nbytes() + nodes.nbytes(),
                 "nodes_expanded": nodes_expanded
             }
 
-        for action, new_state in get_neighbors(node.state, size):
-            new_tuple = tuple(new_state)
-            if new_tuple not in visited:
-                visited.add(new_tuple)
-                g = node.cost + 1
-                h = manhattan_distance(new_state, goal_state, size)
-                pq.put(Node(new_state, parent=node, action=action, cost=g), g + h)
-
-        max_frontier_size = max(max_frontier_size, len(visited) + len(pq.elements))
+        g = nodes.g[node] + 1
+        for action, target, shift, delta in moves.moves_from(blank, nodes.action(node)):
+            tile = (state >> shift) & moves.mask
+            new_state = state + tile * delta
+            if reopen:
+                if g >= visited.get(new_state, g + 1):
+                    continue
+                visited[new_state] = g
+            elif not visited.insert(new_state):
+                # Expanded states already hold their best g; an open one is replaced by a cheaper path
+                if new_state not in pq or g >= nodes.g[pq.get_item(new_state)]:
+                    continue
+            h = estimator.update(nodes.h[node], new_state, tile, target, blank)  # Tile slides from target into the blank
+            child = nodes.add(new_state, target, parent=node, action=action, g=g, h=h)
+            pq.add(new_state, child, g + h, g)
 
     return {
         "status": "No path",
         "solution_path": [],
         "solution_length": 0,
         "time_taken": round(time.perf_counter() - start_time, 6),
-        "space_used": max_frontier_size,
+        "space_used": visited.nbytes() + nodes.nbytes(),
         "nodes_expanded": nodes_expanded
-    }
\ No newline at end of file
+    }
@@ -1,13 +1,18 @@
 # algorithms/bfs.py
-from utils.node import Node
-from utils.move import get_neighbors
+from collections import deque
+from utils.move import get_move_table
+from utils.node import NodeArena
+from utils.state import blank_index
+from utils.closed_set import make_closed_set
 import time
 
-def solve(initial_state, goal_state, size, heuristic=None):
+def solve(initial_state, goal_state, size, heuristic=None, closed_set="auto", budget=None):
     start_time = time.perf_counter()
-    visited = set()
-    frontier = [Node(initial_state)]
-    visited.add(tuple(initial_state))
+    moves = get_move_table(size)
+    nodes = NodeArena(size)  # Parent links live in the arena; frontier entries are node indexes
+    visited = make_closed_set(size, closed_set)
+    visited.add(initial_state)
+    frontier = deque([nodes.add(initial_state, blank_index(initial_state, size))])
     nodes_expanded = 0
 
     if initial_state == goal_state:
@@ -16,36 +21,43 @@ def solve(initial_state, goal_state, size, heuristic=None):
             "solution_path": [],
             "solution_length": 0,
             "time_taken": round(time.perf_counter() - start_time, 6),
-            "space_used": len(visited),
+            "space_used": visited.nbytes() + nodes.nbytes(),
             "nodes_expanded": nodes_expanded
         }
 
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(frontier), "depth": nodes.g[frontier[0]] if frontier else 0})
+
     while frontier:
-        node = frontier.pop(0)
-        nodes_expanded += 1        
+        if budget is not None and budget.exhausted(nodes_expanded):
+            # Every board up to the depth of the next node has been generated and tested
+            return budget.result(start_time, nodes_expanded, visited.nbytes() + nodes.nbytes(),
+                                 lower_bound=nodes.g[frontier[0]] + 1, frontier_size=len(frontier))
+        node = frontier.popleft()
+        nodes_expanded += 1
 
-        for action, new_state in get_neighbors(node.state, size):
-            if tuple(new_state) not in visited:
-                child_node = Node(new_state, parent=node, action=action, depth=node.depth+1)
-                visited.add(tuple(new_state))
+        for action, new_state, new_blank in moves.neighbors(nodes.state[node], nodes.blank[node], nodes.action(node)):
+            if visited.insert(new_state):
+                child = nodes.add(new_state, new_blank, parent=node, action=action, g=nodes.g[node] + 1)
 
                 if new_state == goal_state:
+                    path = nodes.extract_path(child)
                     return {
                         "status": "Path found",
-                        "solution_path": child_node.extract_path(),
-                        "solution_length": len(child_node.extract_path()),
+                        "solution_path": path,
+                        "solution_length": len(path),
                         "time_taken": round(time.perf_counter() - start_time, 6),
-                        "space_used": len(visited),
+                        "space_used": visited.nbytes() + nodes.nbytes(),
                         "nodes_expanded": nodes_expanded
                     }
 
-                frontier.append(child_node)
+                frontier.append(child)
 
     return {
         "status": "No path",
         "solution_path": [],
         "solution_length": 0,
         "time_taken": round(time.perf_counter() - start_time, 6),
-        "space_used": len(visited),
+        "space_used": visited.nbytes() + nodes.nbytes(),
         "nodes_expanded": nodes_expanded
-    }
\ No newline at end of file
+    }
@@ -1,48 +1,53 @@
-# algorithms/bfs.py
-from utils.node import Node
-from utils.move import get_neighbors
+# algorithms/bi_bfs.py
+from utils.move import get_move_table
+from utils.node import NodeArena
+from utils.state import blank_index
+from utils.closed_set import make_closed_set
+from utils.budget import BudgetExceeded
 import time
 
 
-def reverse_path_moves(path):
-    translate_table = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
-    return [translate_table[move] for move in path]
-
-
-def join_path(meeting_state, frontier_f, frontier_b):
-    node_f = next((node for node in frontier_f if node.state == meeting_state))
-    path_f = node_f.extract_path()
-
-    node_b = next((node for node in frontier_b if node.state == meeting_state))
-    path_b = node_b.extract_path()
-    reversed_path_b = path_b[::-1]
-    reversed_moves_path_b = reverse_path_moves(reversed_path_b)
-
-    path_f.extend(reversed_moves_path_b)
-    return path_f
+def expand_layer(layer, moves, nodes, visited, opposite_layer, budget=None, expanded_before=0):
+    """Expand a whole BFS layer of one direction.
 
+    Layers map each of their states to its node in the direction's arena.
+    Return (next_layer, meeting, nodes_expanded), meeting being the pair of
+    (this direction's node, the other direction's node) of the first child
+    that is in the other direction's current layer, or None. A child the
+    other direction reached in an older layer would have had a neighbour
+    checked against this direction when that layer was expanded, so the
+    meeting would have been found then: looking up that one layer is enough.
+    Both directions only ever hold complete layers, so the first meeting found
+    is on a shortest path. Raise BudgetExceeded when the budget runs out
+    mid-layer.
+    """
+    next_layer = {}
+    nodes_expanded = 0
+    for node in layer.values():
+        if budget is not None:
+            budget.charge(expanded_before + nodes_expanded)
+        nodes_expanded += 1
+        for action, new_state, new_blank in moves.neighbors(nodes.state[node], nodes.blank[node], nodes.action(node)):
+            if visited.insert(new_state):
+                child = nodes.add(new_state, new_blank, parent=node, action=action)
+                next_layer[new_state] = child
 
-def bi_search_proceed(current_node, size, frontier, visited, opposite_visited):
-    for action, new_state in get_neighbors(current_node.state, size):
-        if tuple(new_state) not in visited:
-            child_node = Node(new_state, parent=current_node, action=action, depth=current_node.depth+1)
-            visited.add(tuple(new_state))
-            frontier.append(child_node)
-            
-            # Check meeting state
-            if tuple(new_state) in opposite_visited:
-                return new_state
-    return None
+                # Check meeting state
+                opposite_node = opposite_layer.get(new_state)
+                if opposite_node is not None:
+                    return next_layer, (child, opposite_node), nodes_expanded
+    return next_layer, None, nodes_expanded
 
 
-def solve(initial_state, goal_state, size, heuristic=None):
+def solve(initial_state, goal_state, size, heuristic=None, closed_set="auto", budget=None):
     start_time = time.perf_counter()
-    visited_f = set()
-    visited_b = set()
-    frontier_f = [Node(initial_state)]
-    frontier_b = [Node(goal_state)]
-    visited_f.add(tuple(initial_state))
-    visited_b.add(tuple(goal_state))
+    moves = get_move_table(size)
+    nodes_f, nodes_b = NodeArena(size), NodeArena(size)
+    layer_f = {initial_state: nodes_f.add(initial_state, blank_index(initial_state, size))}
+    layer_b = {goal_state: nodes_b.add(goal_state, blank_index(goal_state, size))}
+    visited_f, visited_b = make_closed_set(size, closed_set), make_closed_set(size, closed_set)
+    visited_f.add(initial_state)
+    visited_b.add(goal_state)
     nodes_expanded = 0
 
     if initial_state == goal_state:
@@ -51,32 +56,47 @@ def solve(initial_state, goal_state, size, heuristic=None):
             "solution_path": [],
             "solution_length": 0,
             "time_taken": round(time.perf_counter() - start_time, 6),
-            "space_used": len(visited_f) + len(visited_b),
+            "space_used": visited_f.nbytes() + visited_b.nbytes() + nodes_f.nbytes() + nodes_b.nbytes(),
             "nodes_expanded": nodes_expanded
         }
 
-    meeting_state = None
-    while meeting_state is None:
-        if (not frontier_f) or (not frontier_b):
+    meeting = None  # Arena indexes of the meeting state in the forward and backward direction
+    depth_f = depth_b = 0  # Layers fully expanded on each side
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(layer_f) + len(layer_b), "depth": depth_f + depth_b})
+    while meeting is None:
+        if (not layer_f) or (not layer_b):
             break
 
-        if frontier_f[0].depth > frontier_b[0].depth:
-            node = frontier_b.pop(0)
-            meeting_state = bi_search_proceed(node, size, frontier_b, visited_b, visited_f)
-        else:
-            node = frontier_f.pop(0)
-            meeting_state = bi_search_proceed(node, size, frontier_f, visited_f, visited_b)
+        # Grow the direction whose frontier layer is smaller
+        try:
+            if len(layer_f) > len(layer_b):
+                layer_b, meeting, expanded = expand_layer(layer_b, moves, nodes_b, visited_b, layer_f,
+                                                          budget, nodes_expanded)
+                if meeting is not None:
+                    meeting = meeting[::-1]
+                depth_b += 1
+            else:
+                layer_f, meeting, expanded = expand_layer(layer_f, moves, nodes_f, visited_f, layer_b,
+                                                          budget, nodes_expanded)
+                depth_f += 1
+        except BudgetExceeded as exc:
+            # No path of up to depth_f + depth_b moves joins the two searches
+            return budget.result(start_time, exc.nodes_expanded,
+                                 visited_f.nbytes() + visited_b.nbytes() + nodes_f.nbytes() + nodes_b.nbytes(),
+                                 lower_bound=depth_f + depth_b + 1)
 
-        nodes_expanded += 1
+        nodes_expanded += expanded
 
-    if meeting_state is not None:
-        path = join_path(meeting_state, frontier_f, frontier_b)
+    if meeting is not None:
+        # Moves from the initial state to the meeting state, then on to the goal
+        path = nodes_f.extract_path(meeting[0]) + nodes_b.extract_reverse_path(meeting[1])
         return {
             "status": "Path found",
             "solution_path": path,
             "solution_length": len(path),
             "time_taken": round(time.perf_counter() - start_time, 6),
-            "space_used": len(visited_f) + len(visited_b),
+            "space_used": visited_f.nbytes() + visited_b.nbytes() + nodes_f.nbytes() + nodes_b.nbytes(),
             "nodes_expanded": nodes_expanded
         }
     
@@ -85,6 +105,6 @@ def solve(initial_state, goal_state, size, heuristic=None):
         "solution_path": [],
         "solution_length": 0,
         "time_taken": round(time.perf_counter() - start_time, 6),
-        "space_used": len(visited_f) + len(visited_b),
+        "space_used": visited_f.nbytes() + visited_b.nbytes() + nodes_f.nbytes() + nodes_b.nbytes(),
         "nodes_expanded": nodes_expanded
-    }
\ No newline at end of file
+    }
@@ -1,13 +1,17 @@
 # algorithms/dfs.py
-from utils.node import Node
-from utils.move import get_neighbors
+from utils.node import NodeArena
+from utils.move import get_move_table
+from utils.state import blank_index
+from utils.closed_set import make_closed_set
 import time
 
-def solve(initial_state, goal_state, size, heuristic=None):
+def solve(initial_state, goal_state, size, heuristic=None, closed_set="auto", budget=None):
     start_time = time.perf_counter()
-    visited = set()
-    frontier = [Node(initial_state)]
-    visited.add(tuple(initial_state))
+    moves = get_move_table(size)
+    visited = make_closed_set(size, closed_set)
+    nodes = NodeArena(size)
+    frontier = [nodes.add(initial_state, blank_index(initial_state, size))]
+    visited.add(initial_state)
     nodes_expanded = 0
 
     if initial_state == goal_state:
@@ -16,26 +20,33 @@ def solve(initial_state, goal_state, size, heuristic=None):
             "solution_path": [],
             "solution_length": 0,
             "time_taken": round(time.perf_counter() - start_time, 6),
-            "space_used": len(visited),
+            "space_used": visited.nbytes() + nodes.nbytes(),
             "nodes_expanded": nodes_expanded
         }
 
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(frontier), "depth": nodes.g[frontier[-1]] if frontier else 0})
+
     while frontier:
+        if budget is not None and budget.exhausted(nodes_expanded):
+            return budget.result(start_time, nodes_expanded, visited.nbytes() + nodes.nbytes(),
+                                 depth_reached=nodes.g[frontier[-1]], frontier_size=len(frontier))
         node = frontier.pop()
         nodes_expanded += 1
 
-        for action, new_state in reversed(get_neighbors(node.state, size)):  # Reverse to explore left -> right
-            if tuple(new_state) not in visited:
-                child_node = Node(new_state, parent=node, action=action, depth=node.depth+1)
-                visited.add(tuple(new_state))
+        neighbors = moves.neighbors(nodes.state[node], nodes.blank[node], nodes.action(node))
+        for action, new_state, new_blank in reversed(neighbors):  # Reverse to explore left -> right
+            if visited.insert(new_state):
+                child_node = nodes.add(new_state, new_blank, parent=node, action=action, g=nodes.g[node] + 1)
 
                 if new_state == goal_state:
+                    path = nodes.extract_path(child_node)
                     return {
                         "status": "Path found",
-                        "solution_path": child_node.extract_path(),
-                        "solution_length": len(child_node.extract_path()),
+                        "solution_path": path,
+                        "solution_length": len(path),
                         "time_taken": round(time.perf_counter() - start_time, 6),
-                        "space_used": len(visited),
+                        "space_used": visited.nbytes() + nodes.nbytes(),
                         "nodes_expanded": nodes_expanded
                     }
 
@@ -46,6 +57,6 @@ def solve(initial_state, goal_state, size, heuristic=None):
         "solution_path": [],
         "solution_length": 0,
         "time_taken": round(time.perf_counter() - start_time, 6),
-        "space_used": len(visited),
+        "space_used": visited.nbytes() + nodes.nbytes(),
         "nodes_expanded": nodes_expanded
     }
\ No newline at end of file
@@ -0,0 +1,79 @@
+# algorithms/ida_star.py
+from utils.move import get_move_table
+from utils.heuristics import make_heuristic
+from utils.state import blank_index
+from utils.budget import BudgetExceeded
+import math
+import time
+
+
+FOUND = -1
+
+
+def solve(initial_state, goal_state, size, heuristic='manhattan', budget=None):
+    start_time = time.perf_counter()
+    moves = get_move_table(size)
+    estimator = make_heuristic(heuristic, goal_state, size)
+    mask = moves.mask
+    path = []  # Moves of the current branch, the only memory that grows with depth
+    nodes_expanded = 0
+    max_depth = 0
+
+    def search(state, blank, g, h, bound, last_action):
+        """Depth-first search below f-bound. Return FOUND or the smallest f that exceeded the bound."""
+        nonlocal nodes_expanded, max_depth
+        f = g + h
+        if f > bound:
+            return f
+        if state == goal_state:
+            return FOUND
+
+        if budget is not None:
+            budget.charge(nodes_expanded)
+        nodes_expanded += 1
+        max_depth = max(max_depth, g)
+        next_bound = math.inf
+        for action, target, shift, delta in moves.moves_from(blank, last_action):
+            tile = (state >> shift) & mask
+            path.append(action)
+            child = state + tile * delta
+            t = search(child, target, g + 1, estimator.update(h, child, tile, target, blank), bound, action)
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            next_bound = min(next_bound, t)
+        return next_bound
+
+    h = estimator.estimate(initial_state)
+    blank = blank_index(initial_state, size)
+    bound = h
+    if budget is not None:
+        budget.watch(lambda: {"f_bound": bound, "depth": len(path)})
+    while True:
+        try:
+            t = search(initial_state, blank, 0, h, bound, None)
+        except BudgetExceeded:
+            # Every threshold below bound was searched in full without reaching the goal
+            return budget.result(start_time, nodes_expanded, max_depth + 1, lower_bound=bound)
+
+        if t == FOUND:
+            return {
+                "status": "Path found",
+                "solution_path": list(path),
+                "solution_length": len(path),
+                "time_taken": round(time.perf_counter() - start_time, 6),
+                "space_used": max_depth + 1,
+                "nodes_expanded": nodes_expanded
+            }
+
+        if t == math.inf:
+            return {
+                "status": "No path",
+                "solution_path": [],
+                "solution_length": 0,
+                "time_taken": round(time.perf_counter() - start_time, 6),
+                "space_used": max_depth + 1,
+                "nodes_expanded": nodes_expanded
+            }
+
+        bound = t
@@ -1,62 +1,86 @@
-from utils.node import Node
-from utils.move import get_neighbors
+# algorithms/ids.py
+from utils.move import get_move_table
+from utils.state import blank_index
+from utils.budget import BudgetExceeded
 import time
 import itertools
 
 
 PATH_FOUND, CUTOFF, FAILURE = 'Path found', 'cutoff', 'No path'
 
+TABLE_SIZE = 1 << 20  # Default cap on transposition table entries, 0 disables it
 
-def is_in_path(node, state):
-    while node:
-        if node.state == state:
-            return True
-        node = node.parent
-    return False
 
+def iterative_dls(initial_state, goal_state, size, depth_limit, moves, table=None, table_size=TABLE_SIZE,
+                  budget=None, expanded_before=0):
+    """Depth-limited DFS that applies and undoes moves on one packed board.
 
-def iterative_dls(initial_state, goal_state, size, depth_limit):
-    frontier = [Node(initial_state)]
+    The current branch is the only path kept. Reverse moves are never generated,
+    and table maps a state to the largest remaining depth already searched from it
+    without reaching the goal, so a transposition with no more depth left is skipped.
+    The table only holds facts about the goal, so it can be shared across iterations.
+    Raise BudgetExceeded when the budget runs out.
+    """
+    mask = moves.mask
+    path = []
     nodes_expanded = 0
     cutoff_occurred = False
 
-    while frontier:
-        node = frontier.pop()
-
-        if node.state == goal_state:
-            return {
-                "found": PATH_FOUND,
-                "node": node,
-                "nodes_expanded": nodes_expanded
-            }
-        
-        if node.depth >= depth_limit:
+    def search(state, blank, remaining, last_action):
+        nonlocal nodes_expanded, cutoff_occurred
+        if state == goal_state:
+            return True
+        if remaining == 0:
             cutoff_occurred = True
-            continue
-        
+            return False
+        if table is not None:
+            searched = table.get(state, -1)
+            if searched >= remaining:
+                cutoff_occurred = True
+                return False
+
+        if budget is not None:
+            budget.charge(expanded_before + nodes_expanded)
         nodes_expanded += 1
-        
-        for action, new_state in reversed(get_neighbors(node.state, size)):
-            if not is_in_path(node, new_state):  # Check cycle
-                frontier.append(Node(new_state, parent=node, action=action, depth=node.depth + 1))
+        for action, target, shift, delta in moves.moves_from(blank, last_action):
+            tile = (state >> shift) & mask
+            path.append(action)
+            if search(state + tile * delta, target, remaining - 1, action):
+                return True
+            path.pop()
+
+        if table is not None and (state in table or len(table) < table_size):
+            table[state] = remaining
+        return False
 
+    found = search(initial_state, blank_index(initial_state, size), depth_limit, None)
     return {
-        "found": CUTOFF if cutoff_occurred else FAILURE,
+        "found": PATH_FOUND if found else CUTOFF if cutoff_occurred else FAILURE,
+        "path": path,
         "nodes_expanded": nodes_expanded
     }
 
 
-def solve(initial_state, goal_state, size, heuristic=None):
+def solve(initial_state, goal_state, size, heuristic=None, table_size=TABLE_SIZE, budget=None):
     start_time = time.perf_counter()
+    moves = get_move_table(size)
+    table = {} if table_size else None
     nodes_expanded_total = 0
+    if budget is not None:
+        budget.watch(lambda: {"depth": depth_limit})
 
     for depth_limit in itertools.count(0):
-        result = iterative_dls(initial_state, goal_state, size, depth_limit)
+        try:
+            result = iterative_dls(initial_state, goal_state, size, depth_limit, moves, table, table_size,
+                                   budget, nodes_expanded_total)
+        except BudgetExceeded as exc:
+            # Every shallower limit was searched in full without reaching the goal
+            return budget.result(start_time, exc.nodes_expanded, depth_limit, lower_bound=depth_limit)
 
         nodes_expanded_total += result["nodes_expanded"]
 
         if result["found"] is not CUTOFF:
-            path = [] if result["found"] is FAILURE else result["node"].extract_path()
+            path = result["path"] if result["found"] is PATH_FOUND else []
             return {
                 "status": result["found"],
                 "solution_path": path,
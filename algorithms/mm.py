@@ -0,0 +1,142 @@
+# algorithms/mm.py
+"""MM: bidirectional heuristic search that meets in the middle (Holte et al., 2016).
+
+Each direction orders its open list by pr(n) = max(g + h, 2g), so neither
+search runs past the midpoint of an optimal path. The cheapest meeting U
+found so far is optimal once U <= min(prmin_forward, prmin_backward).
+"""
+from utils.move import get_move_table
+from utils.heuristics import make_heuristic
+from utils.node import NodeArena
+from utils.state import blank_index
+from utils.closed_set import make_closed_set
+from utils.errors import UnsupportedError
+import heapq
+import sys
+import math
+import time
+
+# Heuristics that precompute a table per goal. The backward search's goal is the
+# initial state, so each board would pay for a fresh table (seconds for pdb/oracle).
+GOAL_TABLE_HEURISTICS = {"pdb", "oracle"}
+
+
+class SearchDirection:
+    """Open list, node arena, best node per state and closed set of one search direction."""
+
+    def __init__(self, root, root_blank, estimator, size, closed_set="auto"):
+        h = estimator.estimate(root)
+        self.estimator = estimator
+        self.nodes = NodeArena(size)
+        self.index = {root: self.nodes.add(root, root_blank, h=h)}  # state -> node with the best g
+        self.closed = make_closed_set(size, closed_set)
+        self.open = [(h, 0, self.index[root])]  # (pr, g, node)
+        self.nodes_expanded = 0
+
+    def nbytes(self):
+        """Bytes held by the node arena, the closed set and the state index with the ints it references."""
+        index = sys.getsizeof(self.index) + sum(sys.getsizeof(state) + sys.getsizeof(node)
+                                                for state, node in self.index.items())
+        return self.nodes.nbytes() + self.closed.nbytes() + index
+
+    def best_g(self, state):
+        node = self.index.get(state)
+        return math.inf if node is None else self.nodes.g[node]
+
+    def min_priority(self):
+        """Smallest pr on the open list, dropping stale heap entries first."""
+        while self.open:
+            node = self.open[0][2]
+            state = self.nodes.state[node]
+            if state in self.closed or self.index[state] != node:
+                heapq.heappop(self.open)
+                continue
+            return self.open[0][0]
+        return math.inf
+
+
+def solve(initial_state, goal_state, size, heuristic='manhattan', closed_set="auto", budget=None):
+    if heuristic in GOAL_TABLE_HEURISTICS:
+        raise UnsupportedError(f"mm does not support the {heuristic} heuristic: it would build a table per board "
+                         f"for the backward search")
+    start_time = time.perf_counter()
+    moves = get_move_table(size)
+    mask = moves.mask
+
+    # The backward search estimates the distance to the initial state
+    forward = SearchDirection(initial_state, blank_index(initial_state, size),
+                              make_heuristic(heuristic, goal_state, size), size, closed_set)
+    backward = SearchDirection(goal_state, blank_index(goal_state, size),
+                               make_heuristic(heuristic, initial_state, size), size, closed_set)
+
+    best_cost = 0 if initial_state == goal_state else math.inf
+    meeting_state = initial_state if initial_state == goal_state else None
+
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(forward.open) + len(backward.open),
+                              "f_bound": min(forward.min_priority(), backward.min_priority())})
+
+    while True:
+        pr_f = forward.min_priority()
+        pr_b = backward.min_priority()
+        if best_cost <= min(pr_f, pr_b) or min(pr_f, pr_b) == math.inf:
+            break
+        if budget is not None and budget.exhausted(forward.nodes_expanded + backward.nodes_expanded):
+            # MM's stopping rule: C* >= min(prmin_f, prmin_b), and C* <= the best meeting found so far
+            partial = {"lower_bound": min(pr_f, pr_b)}
+            if meeting_state is not None:
+                partial["upper_bound"] = best_cost
+            return budget.result(start_time, forward.nodes_expanded + backward.nodes_expanded,
+                                 forward.nbytes() + backward.nbytes(), **partial,
+                                 nodes_expanded_forward=forward.nodes_expanded,
+                                 nodes_expanded_backward=backward.nodes_expanded)
+
+        side, other = (forward, backward) if pr_f <= pr_b else (backward, forward)
+        _, g, node = heapq.heappop(side.open)
+        nodes = side.nodes
+        state, blank, h = nodes.state[node], nodes.blank[node], nodes.h[node]
+        side.closed.add(state)
+        side.nodes_expanded += 1
+
+        for action, target, shift, delta in moves.moves_from(blank, nodes.action(node)):
+            tile = (state >> shift) & mask
+            child = state + tile * delta
+            child_g = g + 1
+            if child_g >= side.best_g(child):
+                continue
+
+            child_h = side.estimator.update(h, child, tile, target, blank)
+            child_node = nodes.add(child, target, parent=node, action=action, g=child_g, h=child_h)
+            side.index[child] = child_node
+            side.closed.discard(child)
+            heapq.heappush(side.open, (max(child_g + child_h, 2 * child_g), child_g, child_node))
+
+            other_g = other.best_g(child)
+            if child_g + other_g < best_cost:
+                best_cost = child_g + other_g
+                meeting_state = child
+
+    if meeting_state is not None:
+        path = (forward.nodes.extract_path(forward.index[meeting_state])
+                + backward.nodes.extract_reverse_path(backward.index[meeting_state]))
+        return {
+            "status": "Path found",
+            "solution_path": path,
+            "solution_length": len(path),
+            "time_taken": round(time.perf_counter() - start_time, 6),
+            "space_used": forward.nbytes() + backward.nbytes(),
+            "nodes_expanded": forward.nodes_expanded + backward.nodes_expanded,
+            "nodes_expanded_forward": forward.nodes_expanded,
+            "nodes_expanded_backward": backward.nodes_expanded
+        }
+
+    return {
+        "status": "No path",
+        "solution_path": [],
+        "solution_length": 0,
+        "time_taken": round(time.perf_counter() - start_time, 6),
+        "space_used": forward.nbytes() + backward.nbytes(),
+        "nodes_expanded": forward.nodes_expanded + backward.nodes_expanded,
+        "nodes_expanded_forward": forward.nodes_expanded,
+        "nodes_expanded_backward": backward.nodes_expanded
+    }
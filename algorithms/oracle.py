@@ -0,0 +1,47 @@
+# algorithms/oracle.py
+"""Optimal solutions by lookup in the exhaustive distance table (3x3 and smaller).
+
+From each board, take any move to a neighbour one step closer to the goal.
+After the one-off table build, a query costs O(depth) lookups and no search.
+"""
+from utils.move import get_move_table
+from utils.distance_table import DistanceTable, UNREACHED
+from utils.state import blank_index
+import time
+
+
+def solve(initial_state, goal_state, size, heuristic=None, budget=None):
+    # Answers in O(depth) lookups, so there is nothing for a budget to cut short
+    start_time = time.perf_counter()
+    moves = get_move_table(size)
+    distances = DistanceTable(goal_state, size)
+    state, blank, last_action = initial_state, blank_index(initial_state, size), None
+    distance = distances.estimate(state)
+    path = []
+
+    if distance == UNREACHED:
+        return {
+            "status": "No path",
+            "solution_path": [],
+            "solution_length": 0,
+            "time_taken": round(time.perf_counter() - start_time, 6),
+            "space_used": distances.nbytes(),
+            "nodes_expanded": 0
+        }
+
+    while distance:
+        for action, child, child_blank in moves.neighbors(state, blank, last_action):
+            if distances.estimate(child) == distance - 1:
+                path.append(action)
+                state, blank, last_action = child, child_blank, action
+                distance -= 1
+                break
+
+    return {
+        "status": "Path found",
+        "solution_path": path,
+        "solution_length": len(path),
+        "time_taken": round(time.perf_counter() - start_time, 6),
+        "space_used": distances.nbytes(),
+        "nodes_expanded": len(path)
+    }
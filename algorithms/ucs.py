@@ -1,46 +1,60 @@
 # algorithms/ucs.py
-from utils.node import Node
-from utils.move import get_neighbors
-from utils.priority_queue import PriorityQueue
+from utils.node import NodeArena
+from utils.move import get_move_table
+from utils.state import blank_index
+from utils.closed_set import make_closed_set
+from utils.priority_queue import OPEN_LISTS
 import time
 
-def solve(initial_state, goal_state, size, heuristic=None):
+def solve(initial_state, goal_state, size, heuristic=None, open_list="heap", closed_set="auto", budget=None):
     start_time = time.perf_counter()
-    visited = set()
-    frontier = PriorityQueue()
+    moves = get_move_table(size)
+    visited = make_closed_set(size, closed_set)
+    frontier = OPEN_LISTS[open_list]()
 
-    visited.add(tuple(initial_state))
-    frontier.add(Node(initial_state), 0)
+    nodes = NodeArena(size)
+    visited.add(initial_state)
+    frontier.add(initial_state, nodes.add(initial_state, blank_index(initial_state, size)), 0)
     nodes_expanded = 0
+    node_f_cost = 0
+    if budget is not None:
+        budget.watch(lambda: {"frontier_size": len(frontier), "f_bound": node_f_cost})
 
     while frontier:
+        if budget is not None and budget.exhausted(nodes_expanded):
+            # Costs leave the open list in order, so no cheaper path remains
+            return budget.result(start_time, nodes_expanded, visited.nbytes() + nodes.nbytes(),
+                                 lower_bound=node_f_cost, frontier_size=len(frontier))
         node, node_f_cost = frontier.pop()
+        state = nodes.state[node]
         nodes_expanded += 1
 
-        if node.state == goal_state:
+        if state == goal_state:
+            path = nodes.extract_path(node)
             return {
                 "status": "Path found",
-                "solution_path": node.extract_path(),
-                "solution_length": len(node.extract_path()),
+                "solution_path": path,
+                "solution_length": len(path),
                 "time_taken": round(time.perf_counter() - start_time, 6),
-                "space_used": len(visited),
+                "space_used": visited.nbytes() + nodes.nbytes(),
                 "nodes_expanded": nodes_expanded
             }  
 
-        for action, new_state in get_neighbors(node.state, size):
+        for action, new_state, new_blank in moves.neighbors(state, nodes.blank[node], nodes.action(node)):
             child_f_cost = node_f_cost + 1
-            if tuple(new_state) not in visited:
-                visited.add(tuple(new_state))
-                frontier.add(Node(new_state, parent=node, action=action, depth=node.depth+1), child_f_cost)
-            elif tuple(new_state) in frontier and child_f_cost + 1 < frontier.get_priority(tuple(new_state)):
+            if visited.insert(new_state):
+                child = nodes.add(new_state, new_blank, parent=node, action=action, g=child_f_cost)
+                frontier.add(new_state, child, child_f_cost, child_f_cost)
+            elif new_state in frontier and child_f_cost + 1 < frontier.get_priority(new_state):
                 # Replace old node with new node that hold the same state
-                frontier.add(Node(new_state, parent=node, action=action, depth=node.depth+1), child_f_cost)
+                child = nodes.add(new_state, new_blank, parent=node, action=action, g=child_f_cost)
+                frontier.add(new_state, child, child_f_cost, child_f_cost)
 
     return {
         "status": "No path",
         "solution_path": [],
         "solution_length": 0,
         "time_taken": round(time.perf_counter() - start_time, 6),
-        "space_used": len(visited),
+        "space_used": visited.nbytes() + nodes.nbytes(),
         "nodes_expanded": nodes_expanded
     }
\ No newline at end of file
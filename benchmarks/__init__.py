@@ -0,0 +1 @@
+# Benchmark suite: seeded instance sets, runner and regression gate
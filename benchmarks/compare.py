@@ -0,0 +1,255 @@
+# benchmarks/compare.py
+
+"""Compare two benchmark result files and fail on performance regressions.
+
+Cells are matched on (algorithm, heuristic, bucket). Within a cell, time is
+compared board by board: the cell's change is the geometric mean of the
+per-board ratios of board_work, each process's best time divided by its own
+calibration (see benchmarks/run.py), so a slow board cannot hide a regression
+on the fast ones and a slower machine or process does not read as a slower
+solver. A slowdown then only counts when it is larger than the noise both runs
+measured between their processes and the boards agree on it: the mean log
+ratio must stay above zero by CONFIDENCE_Z standard errors. A cell's noise
+comes from only a few processes and can come out near zero by luck, so it is
+never taken below the run's typical noise, the median over its gated cells.
+
+Boards that take under MIN_TIME in both runs are shown in the cell's change
+but never gate it. At that scale a fresh process alone moves the time by tens
+of percent. A cell whose boards are all that fast is marked "not gated".
+
+For each cell, the metrics and the rule that makes each one a regression:
+
+  time              slower by more than the threshold and the noise
+  nodes_per_second  the same test on time per node expanded, board by board
+  peak_memory       higher by more than the memory threshold and MEMORY_SLACK
+  solved, optimal   any drop; a solver that stops finishing or loses
+                    optimality is a regression whatever its speed
+
+The exit status is 1 if any cell regressed and 0 otherwise. It is 2 if the
+runs used different boards (their instance-set digests differ).
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+BASELINE_FILE = os.path.join("data", "benchmarks", "baseline.json")
+THRESHOLD = 0.10  # Relative slowdown tolerated on top of the measured noise
+MEMORY_THRESHOLD = 0.10
+MEMORY_SLACK = 8 * 1024 * 1024  # Bytes of peak-RSS growth ignored: allocator and interpreter jitter
+NOISE_FACTOR = 3  # Noise bands (in standard deviations) a change must clear
+CONFIDENCE_Z = 2  # Standard errors the per-board slowdowns must clear together
+MIN_TIME = 0.01  # Seconds; boards faster than this in both runs are reported but do not gate
+TIME_FLOOR = 1e-6  # Times are rounded to microseconds; clamp so a 0 does not break the log
+
+
+def load_results(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def cell_key(cell):
+    return cell["algorithm"], cell["heuristic"], cell["bucket"]
+
+
+def allowed_change(baseline, candidate, threshold, noise_floors=(0.0, 0.0)):
+    """Relative change that counts as real for this cell: the threshold or the noise, whichever is larger.
+
+    time_noise is a relative standard deviation, and the two runs' noise adds in
+    quadrature. Each run's noise is at least its noise_floor (see run_noise).
+    """
+    noise = math.hypot(max(baseline.get("time_noise") or 0, noise_floors[0]),
+                                max(candidate.get("time_noise") or 0, noise_floors[1]))
+    return max(threshold, NOISE_FACTOR * noise)
+
+
+def run_noise(cells):
+    """Median time_noise of the cells with a board that takes at least MIN_TIME: the machine's noise in that run."""
+    noises = sorted(cell.get("time_noise") or 0 for cell in cells if max(cell["board_times"], default=0) >= MIN_TIME)
+    if not noises:
+        return 0.0
+    middle = len(noises) // 2
+    return noises[middle] if len(noises) % 2 else (noises[middle - 1] + noises[middle]) / 2
+
+
+def paired_ratio(baseline, candidate, min_time=MIN_TIME, per_node=False):
+    """(geometric mean of candidate/baseline board_work, standard error of its log).
+
+    Only boards that take at least min_time seconds in one of the runs count.
+    With per_node the work is divided by each board's nodes expanded first,
+    i.e. the ratio of time per node, the inverse of nodes per second. Boards
+    are matched by position; runs with a different --limit share a prefix.
+    """
+    pairs = [pair for pair in zip(baseline["board_times"], candidate["board_times"],
+                                  baseline["board_work"], candidate["board_work"],
+                                  baseline["board_nodes"], candidate["board_nodes"])
+             if max(pair[0], pair[1]) >= min_time]
+    if per_node:
+        pairs = [pair for pair in pairs if pair[4] and pair[5]]
+    if not pairs:
+        return None, None
+    logs = []
+    for _, _, old, new, old_nodes, new_nodes in pairs:
+        log = math.log(max(new, TIME_FLOOR) / max(old, TIME_FLOOR))
+        if per_node:
+            log -= math.log(new_nodes / old_nodes)
+        logs.append(log)
+    mean = sum(logs) / len(logs)
+    if len(logs) < 2:
+        return math.exp(mean), 0.0
+    variance = sum((log - mean) ** 2 for log in logs) / (len(logs) - 1)
+    return math.exp(mean), math.sqrt(variance / len(logs))
+
+
+def slower(ratio, error, allowed):
+    """True when a paired ratio is past the allowed change and the boards agree on it."""
+    return ratio > 1 + allowed and math.log(ratio) - CONFIDENCE_Z * error > 0
+
+
+def faster(ratio, error, allowed):
+    """Mirror of slower: a speedup past the allowed change that the boards agree on."""
+    return ratio < 1 / (1 + allowed) and math.log(ratio) + CONFIDENCE_Z * error < 0
+
+
+def compare_cell(baseline, candidate, threshold=THRESHOLD, memory_threshold=MEMORY_THRESHOLD,
+                 noise_floors=(0.0, 0.0)):
+    """Deltas of one cell and the list of regressions among them.
+
+    deltas["gated"] is False when every board is under MIN_TIME, so time and
+    nodes/s are shown but cannot regress; deltas["faster"] marks a real speedup.
+    """
+    allowed = allowed_change(baseline, candidate, threshold, noise_floors)
+    deltas = {"allowed": allowed, "gated": False, "faster": False}
+    regressions = []
+
+    for metric, per_node in (("time", False), ("nodes_per_second", True)):
+        # Nodes are deterministic, so per node isolates the cost per expansion from search-order changes
+        ratio, _ = paired_ratio(baseline, candidate, min_time=0, per_node=per_node)
+        if ratio is not None:
+            deltas[metric] = ratio - 1 if metric == "time" else 1 / ratio - 1
+        ratio, error = paired_ratio(baseline, candidate, per_node=per_node)
+        if ratio is None:
+            continue
+        deltas["gated"] = True
+        if slower(ratio, error, allowed):
+            regressions.append(metric)
+        elif metric == "time" and faster(ratio, error, allowed):
+            deltas["faster"] = True
+
+    old_memory, new_memory = baseline.get("peak_memory"), candidate.get("peak_memory")
+    if old_memory and new_memory:
+        deltas["peak_memory"] = new_memory / old_memory - 1
+        if new_memory > old_memory * (1 + memory_threshold) and new_memory - old_memory > MEMORY_SLACK:
+            regressions.append("peak_memory")
+
+    for metric in ("solved", "optimal"):
+        old, new = baseline.get(metric), candidate.get(metric)
+        if old is not None and new is not None:
+            deltas[metric] = new - old
+            if new < old:
+                regressions.append(metric)
+
+    return deltas, regressions
+
+
+def mismatched_sets(baseline_doc, candidate_doc):
+    """Names of instance sets both runs used with different boards."""
+    baseline_sets = baseline_doc.get("instance_sets", {})
+    candidate_sets = candidate_doc.get("instance_sets", {})
+    return [name for name in baseline_sets.keys() & candidate_sets.keys()
+            if baseline_sets[name]["digest"] != candidate_sets[name]["digest"]]
+
+
+def format_change(value, percent=True):
+    if value is None:
+        return "-"
+    return f"{value:+.1%}" if percent else f"{value:+.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files; exit 1 on regressions")
+    parser.add_argument('files', nargs='+', metavar='FILE',
+                        help=f'[BASELINE] CANDIDATE; the baseline defaults to {BASELINE_FILE}')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='Relative slowdown tolerated on top of the measured noise (default 0.10)')
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+                        help='Relative peak-memory growth tolerated (default 0.10)')
+    parser.add_argument('--all', action='store_true', help='List every cell, not only the changed ones')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Copy the candidate over the baseline when nothing regressed')
+    args = parser.parse_args()
+
+    if len(args.files) > 2:
+        parser.error("expected [BASELINE] CANDIDATE")
+    baseline_file, candidate_file = args.files if len(args.files) == 2 else (BASELINE_FILE, args.files[0])
+    if not os.path.exists(baseline_file):
+        parser.error(f"no baseline at {baseline_file}; record one with "
+                     f"python -m benchmarks.run --output {baseline_file}")
+    baseline_doc, candidate_doc = load_results(baseline_file), load_results(candidate_file)
+
+    mismatched = mismatched_sets(baseline_doc, candidate_doc)
+    if mismatched:
+        print(f"Instance sets {', '.join(sorted(mismatched))} differ between the runs; regenerate one side "
+              f"so both run the same boards")
+        sys.exit(2)
+    if baseline_doc.get("machine") != candidate_doc.get("machine"):
+        print("Warning: the runs come from different machines or Python versions; timings may not be comparable")
+
+    print(f"Baseline:  {baseline_file} ({baseline_doc.get('commit') or 'unknown commit'}, "
+          f"{baseline_doc.get('created', '?')})")
+    print(f"Candidate: {candidate_file} ({candidate_doc.get('commit') or 'unknown commit'}, "
+          f"{candidate_doc.get('created', '?')})")
+    print()
+
+    baseline_cells = {cell_key(cell): cell for cell in baseline_doc["cells"]}
+    candidate_cells = {cell_key(cell): cell for cell in candidate_doc["cells"]}
+    noise_floors = run_noise(baseline_doc["cells"]), run_noise(candidate_doc["cells"])
+    print(f"Typical noise between processes: {noise_floors[0]:.1%} in the baseline, {noise_floors[1]:.1%} "
+          f"in the candidate")
+    print()
+    regressed, improved, missing = [], [], []
+
+    header = f"{'cell':<44} {'time':>8} {'nodes/s':>8} {'memory':>8} {'solved':>8} {'optimal':>8} {'allowed':>7}"
+    print(header)
+    print("-" * len(header))
+    for key, baseline in baseline_cells.items():
+        candidate = candidate_cells.get(key)
+        label = key[0] + (f"/{key[1]}" if key[1] else "") + f" {key[2]}"
+        if candidate is None:
+            missing.append(label)
+            continue
+        deltas, regressions = compare_cell(baseline, candidate, args.threshold, args.memory_threshold, noise_floors)
+        if regressions:
+            regressed.append((label, regressions))
+        elif deltas["faster"]:
+            improved.append(label)
+        if regressions or deltas["faster"] or args.all:
+            if regressions:
+                mark = "REGRESSED " + ",".join(regressions)
+            else:
+                mark = "improved" if deltas["faster"] else "" if deltas["gated"] else "not gated"
+            print(f"{label:<44} {format_change(deltas.get('time')):>8} "
+                  f"{format_change(deltas.get('nodes_per_second')):>8} {format_change(deltas.get('peak_memory')):>8} "
+                  f"{format_change(deltas.get('solved'), False):>8} {format_change(deltas.get('optimal'), False):>8} "
+                  f"{deltas['allowed']:>7.0%}  {mark}")
+
+    print()
+    new_cells = len(candidate_cells.keys() - baseline_cells.keys())
+    print(f"{len(baseline_cells) - len(missing)} cells compared: {len(regressed)} regressed, {len(improved)} improved"
+          + (f", {new_cells} new" if new_cells else ""))
+    if missing:
+        print(f"Missing from the candidate: {', '.join(missing)}")
+
+    if regressed:
+        sys.exit(1)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_file) or ".", exist_ok=True)
+        with open(baseline_file, 'w') as f:
+            json.dump(candidate_doc, f, indent=2)
+        print(f"Baseline updated: {baseline_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# benchmarks/instances.py
+
+"""Seeded benchmark instance sets.
+
+An instance set is a list of puzzle records in the input format, plus the
+"bucket" it is reported under and its "optimal_length" where that is known.
+Sets are generated from a fixed seed, so every machine benchmarks the same
+boards. They are written once to data/benchmarks/instances as JSONL and read
+back afterwards, and each result file records the digest of the sets it ran
+on, so runs on different boards are never compared.
+
+Two kinds of set:
+  random  uniformly random solvable boards of one size
+  depth   boards grouped into buckets by optimal solution length; exact
+          sampling from the distance table up to 3x3, random walks from the
+          goal with IDA* + pdb for the optimal length on bigger boards
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+
+from algorithms import ida_star
+from utils.budget import Budget
+from utils.distance_table import DistanceTable, MAX_SIZE
+from utils.move import get_move_table
+from utils.rank import state_unrank
+from utils.state import blank_index, pack, unpack
+from utils.validate import is_solvable
+
+INSTANCE_DIR = os.path.join("data", "benchmarks", "instances")
+OPTIMAL_TIME = 60  # Seconds IDA* may spend proving an optimal length on boards without a distance table
+WALK_ATTEMPTS = 200  # Draws per depth bucket before settling for fewer boards
+
+# Set name -> generator parameters. Changing a set changes its boards, and so its digest.
+INSTANCE_SETS = {
+    "random_3x3": {"kind": "random", "size": 3, "count": 20, "seed": 1},
+    "depth_3x3": {"kind": "depth", "size": 3, "buckets": [[1, 7], [8, 15], [16, 23], [24, 31]],
+                  "per_bucket": 5, "seed": 2},
+    "depth_4x4": {"kind": "depth", "size": 4, "buckets": [[1, 9], [10, 19], [20, 29]],
+                  "per_bucket": 3, "seed": 3},
+    "random_4x4": {"kind": "random", "size": 4, "count": 3, "seed": 4},
+}
+
+
+def goal_board(size):
+    """The goal every benchmark board is solved toward: tiles in order, blank last."""
+    return list(range(1, size * size)) + [0]
+
+
+def optimal_length(board, goal, size):
+    """Exact optimal solution length, or None if IDA* could not prove it within OPTIMAL_TIME."""
+    if size <= MAX_SIZE:
+        return DistanceTable(pack(goal, size), size).estimate(pack(board, size))
+    result = ida_star.solve(pack(board, size), pack(goal, size), size, "pdb", budget=Budget(max_time=OPTIMAL_TIME))
+    return result["solution_length"] if result["status"] == "Path found" else None
+
+
+def random_board(size, rng):
+    """Uniformly random board that can reach goal_board(size)."""
+    tiles = goal_board(size)
+    rng.shuffle(tiles)
+    if not is_solvable(tiles, size):
+        # Swapping two tiles flips the permutation parity and so solvability
+        first, second = [index for index, tile in enumerate(tiles) if tile][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+
+def walk_board(size, rng, length):
+    """Board reached from the goal by length random moves, never undoing the previous one."""
+    moves = get_move_table(size)
+    state = pack(goal_board(size), size)
+    blank, last_action = blank_index(state, size), None
+    for _ in range(length):
+        last_action, state, blank = rng.choice(moves.neighbors(state, blank, last_action))
+    return unpack(state, size)
+
+
+def bucket_name(size, low=None, high=None):
+    """Bucket label results are grouped by, e.g. '3x3/random' or '3x3/d08-15'."""
+    if low is None:
+        return f"{size}x{size}/random"
+    return f"{size}x{size}/d{low:02d}-{high:02d}"
+
+
+def random_set(size, count, seed):
+    rng = random.Random(seed)
+    goal = goal_board(size)
+    boards = [random_board(size, rng) for _ in range(count)]
+    return [(board, bucket_name(size), optimal_length(board, goal, size)) for board in boards]
+
+
+def depth_set(size, buckets, per_bucket, seed):
+    rng = random.Random(seed)
+    goal = goal_board(size)
+    instances = []
+    if size <= MAX_SIZE:
+        table = DistanceTable(pack(goal, size), size).table
+        for low, high in buckets:
+            # Depth first, then a board at that depth: boards are far denser near the top of a bucket
+            ranks = {depth: list(_ranks_at(table, depth)) for depth in range(low, high + 1)}
+            depths = [depth for depth in ranks if ranks[depth]]
+            chosen = set()
+            for _ in range(WALK_ATTEMPTS):
+                if len(chosen) == per_bucket:
+                    break
+                chosen.add(rng.choice(ranks[rng.choice(depths)]))
+            for rank in sorted(chosen, key=lambda rank: (table[rank], rank)):
+                board = unpack(state_unrank(rank, size), size)
+                instances.append((board, bucket_name(size, low, high), table[rank]))
+        return instances
+
+    for low, high in buckets:
+        found = []
+        for _ in range(WALK_ATTEMPTS):
+            if len(found) == per_bucket:
+                break
+            # Walks fold back on themselves, so aim a little past the bucket
+            board = walk_board(size, rng, rng.randint(low, high + (high - low) // 2))
+            depth = optimal_length(board, goal, size)
+            if depth is not None and low <= depth <= high and board not in [item[0] for item in found]:
+                found.append((board, bucket_name(size, low, high), depth))
+        instances.extend(found)
+    return instances
+
+
+def _ranks_at(table, depth):
+    """Ranks of every board at this distance, scanning the table with bytes.find."""
+    value = bytes([depth])
+    rank = table.find(value)
+    while rank >= 0:
+        yield rank
+        rank = table.find(value, rank + 1)
+
+
+def generate(name):
+    """Puzzle records of one instance set."""
+    params = INSTANCE_SETS[name]
+    size = params["size"]
+    if params["kind"] == "random":
+        instances = random_set(size, params["count"], params["seed"])
+    else:
+        instances = depth_set(size, params["buckets"], params["per_bucket"], params["seed"])
+    return [{
+        "name": f"{name}:{index}",
+        "size": size,
+        "initial_state": board,
+        "goal_state": goal_board(size),
+        "bucket": bucket,
+        "optimal_length": depth
+    } for index, (board, bucket, depth) in enumerate(instances, 1)]
+
+
+def instance_path(name):
+    return os.path.join(INSTANCE_DIR, f"{name}.jsonl")
+
+
+def load_instance_set(name, regenerate=False):
+    """(records, digest) of an instance set, generating and saving it on first use."""
+    path = instance_path(name)
+    if regenerate or not os.path.exists(path):
+        print(f"Generating instance set {name} ...")
+        records = generate(name)
+        os.makedirs(INSTANCE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, path)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    records = [json.loads(line) for line in data.splitlines() if line.strip()]
+    return records, hashlib.sha256(data).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the seeded benchmark instance sets")
+    parser.add_argument('sets', nargs='*', help=f"Sets to generate (default: all of {', '.join(INSTANCE_SETS)})")
+    parser.add_argument('--force', action='store_true', help='Regenerate sets that already exist')
+    args = parser.parse_args()
+
+    for name in args.sets or INSTANCE_SETS:
+        if name not in INSTANCE_SETS:
+            parser.error(f"unknown instance set {name} (choose from {', '.join(INSTANCE_SETS)})")
+        records, digest = load_instance_set(name, regenerate=args.force)
+        print(f"{instance_path(name)}: {len(records)} boards, sha256 {digest[:12]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+# benchmarks/run.py
+
+"""Run every algorithm and heuristic over the benchmark instance sets.
+
+Each (algorithm, heuristic, bucket) cell runs in a fresh process, so its peak
+resident memory is its own and no table built by an earlier cell is already
+warm. Inside the cell, warmup runs on the first board load the move tables,
+heuristic tables and pattern databases. Every board is then solved repeats
+times with the solution cache off and a budget per run. Runs that hit the
+budget count against "solved" and are timed at the cutoff.
+
+Each process also times a fixed pure-Python workload before and after its
+runs. That calibration tracks how fast the machine ran that process (frequency
+scaling, other load, a different host), and board_work divides each process's
+times by it, so benchmarks/compare.py can tell a slower solver from a slower
+machine.
+
+A cell runs in several processes, one per round, and each round goes through
+every cell before the next starts. Two processes running the same code can
+differ by far more than two repeats inside one process (memory layout, which
+core, what else the machine was doing at that moment), so time_noise is
+measured between the processes' board_work of each board, not between repeats.
+
+Results are one JSON file under data/benchmarks/results:
+
+  {"suite", "created", "commit", "machine", "settings",
+   "instance_sets": {name: {"digest", "boards"}},
+   "cells": [{"algorithm", "heuristic", "bucket", "boards", "processes", "runs",
+              "solved", "time_median", "time_p95", "time_noise", "nodes_median",
+              "nodes_per_second", "space_used_median", "peak_memory",
+              "optimal", "excess_length", "statuses", "calibration",
+              "board_times", "board_work", "board_nodes"}]}
+
+Per board, in instance order: board_times holds the best time in seconds over
+all runs, board_work the median over processes of the process's best time
+divided by its calibration, and board_nodes the median nodes expanded. They are
+for paired comparisons between runs. Interference only ever adds time, so the
+best of several runs is the steadiest estimate, as with timeit; the median over
+processes keeps one odd calibration from deciding the cell. time_noise is the
+median over boards of the relative standard deviation of their per-process
+board_work (of their repeats, with one process). calibration is the median of
+the processes'.
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import time
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from main import ALGORITHMS, HEURISTICS, INFORMED_ALGORITHMS, parse_names, solve_puzzle
+from utils.heuristics import heuristic_names
+from utils.budget import peak_resident_bytes
+from benchmarks.instances import INSTANCE_SETS, load_instance_set
+
+RESULTS_DIR = os.path.join("data", "benchmarks", "results")
+CALIBRATION_ROUNDS = 3
+CALIBRATION_STEPS = 50000  # About 25 ms a round; large enough to feel cache and memory contention
+
+# Suite -> instance sets and default settings; flags override the settings
+SUITES = {
+    "quick": {"sets": ["random_3x3", "depth_3x3"], "limit": 3, "processes": 3, "repeats": 2, "warmup": 1,
+              "max_time": 5},
+    "full": {"sets": list(INSTANCE_SETS), "limit": None, "processes": 3, "repeats": 3, "warmup": 1, "max_time": 10},
+}
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) of values, interpolating between the closest ranks."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def spread(values):
+    """Relative standard deviation: 0 for identical repeats.
+
+    Not the median absolute deviation: over the few processes of a cell it
+    comes out at about half the standard deviation.
+    """
+    center = statistics.mean(values)
+    if len(values) < 2 or center <= 0:
+        return 0.0
+    return statistics.stdev(values) / center
+
+
+def calibrate():
+    """Best time in seconds of a fixed workload shaped like search: int ops, dict and list churn."""
+    best = None
+    for _ in range(CALIBRATION_ROUNDS):
+        start = time.perf_counter()
+        seen = {}
+        frontier = [1]
+        for step in range(CALIBRATION_STEPS):
+            state = (frontier[step // 2] * 0x9E3779B1 + step) & 0xFFFFFFFFFFFF
+            if state not in seen:
+                seen[state] = step
+                frontier.append(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_cell(algorithm, heuristic, puzzles, repeats, warmup, budget):
+    """Solve every puzzle repeats times after warmup runs on the first.
+
+    Return (per-board lists of run results, peak resident bytes of this
+    process, calibration seconds), or None when the solver does not support
+    these boards.
+    """
+    calibration = calibrate()
+    for _ in range(warmup):
+        solve_puzzle(puzzles[0], algorithm, heuristic, cache=None, budget=budget)
+    boards = []
+    for puzzle in puzzles:
+        runs = []
+        for _ in range(repeats):
+            output = solve_puzzle(puzzle, algorithm, heuristic, cache=None, budget=budget)
+            if output["status"] == "Unsupported":
+                return None
+            runs.append({key: output.get(key) for key in
+                         ("status", "time_taken", "nodes_expanded", "space_used", "solution_length")})
+        boards.append(runs)
+    return boards, peak_resident_bytes(), min(calibration, calibrate())
+
+
+def summarize(algorithm, heuristic, bucket, puzzles, results):
+    """Cell record of the results file from the run_cell results of every process of one cell."""
+    boards = [[run for result in results for run in result[0][index]] for index in range(len(puzzles))]
+    runs = [run for board in boards for run in board]
+    times = [run["time_taken"] for run in runs]
+    total_time = sum(times)
+    total_nodes = sum(run["nodes_expanded"] for run in runs)
+
+    # Each process's best time of each board, in units of that process's calibration: how fast a
+    # fresh process runs varies by tens of percent, and its calibration tracks most of that.
+    # Calibrations have outliers of their own, so the cell keeps the median process, not the best
+    work = [[min(run["time_taken"] for run in result[0][index]) / result[2] for result in results]
+            for index in range(len(puzzles))]
+    if len(results) > 1:
+        samples = work
+    else:
+        samples = [[run["time_taken"] for run in board] for board in boards]
+
+    statuses = {}
+    for run in runs:
+        statuses[run["status"]] = statuses.get(run["status"], 0) + 1
+
+    # Optimality over runs that found a path on boards whose optimal length is known
+    lengths = [(run["solution_length"], puzzle["optimal_length"])
+               for puzzle, board in zip(puzzles, boards) for run in board
+               if run["status"] == "Path found" and puzzle.get("optimal_length") is not None]
+
+    return {
+        "algorithm": algorithm,
+        "heuristic": heuristic,
+        "bucket": bucket,
+        "boards": len(boards),
+        "processes": len(results),
+        "runs": len(runs),
+        "solved": round(statuses.get("Path found", 0) / len(runs), 4),
+        "time_median": round(statistics.median(times), 6),
+        "time_p95": round(percentile(times, 95), 6),
+        "time_noise": round(statistics.median(spread(sample) for sample in samples), 4),
+        "nodes_median": statistics.median(run["nodes_expanded"] for run in runs),
+        "nodes_per_second": round(total_nodes / total_time) if total_time > 0 else None,
+        "space_used_median": statistics.median(run["space_used"] for run in runs),
+        "peak_memory": max(result[1] for result in results),
+        "optimal": round(sum(length == best for length, best in lengths) / len(lengths), 4) if lengths else None,
+        "excess_length": round(sum(length - best for length, best in lengths) / len(lengths), 4) if lengths else None,
+        "statuses": statuses,
+        "calibration": round(statistics.median(result[2] for result in results), 6),
+        "board_times": [min(run["time_taken"] for run in board) for board in boards],
+        "board_work": [statistics.median(board) for board in work],
+        "board_nodes": [statistics.median(run["nodes_expanded"] for run in board) for board in boards]
+    }
+
+
+def cell_label(algorithm, heuristic, bucket):
+    return f"{algorithm}" + (f"/{heuristic}" if heuristic else "") + f" on {bucket}"
+
+
+def group_buckets(records, limit=None):
+    """bucket -> puzzles, in instance order, at most limit per bucket."""
+    buckets = {}
+    for record in records:
+        puzzles = buckets.setdefault(record["bucket"], [])
+        if limit is None or len(puzzles) < limit:
+            puzzles.append({**record, "solvable": True})  # Generated boards are solvable by construction
+    return buckets
+
+
+def git_commit():
+    """Commit of the working tree being measured, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(suite, algorithms, heuristics, settings):
+    """Run the suite and return the results document."""
+    budget = {"max_time": settings["max_time"]}
+    if settings["max_memory"]:
+        budget["max_memory"] = settings["max_memory"]
+
+    document = {
+        "suite": suite,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count()
+        },
+        "settings": settings,
+        "instance_sets": {},
+        "cells": []
+    }
+
+    cells = []
+    for name in settings["sets"]:
+        records, digest = load_instance_set(name)
+        buckets = group_buckets(records, settings["limit"])
+        document["instance_sets"][name] = {"digest": digest, "boards": sum(map(len, buckets.values()))}
+        for algorithm in algorithms:
+            for heuristic in heuristics if algorithm in INFORMED_ALGORITHMS else [None]:
+                cells.extend((algorithm, heuristic, bucket, puzzles) for bucket, puzzles in buckets.items())
+
+    # One cell at a time: parallel cells would compete for cores and memory bandwidth. Rounds go
+    # through every cell, so a slow spell of the machine hits one process of many cells, not a whole cell.
+    rounds = settings["processes"]
+    results = [[] for _ in cells]
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        for round_number in range(1, rounds + 1):
+            for index, (algorithm, heuristic, bucket, puzzles) in enumerate(cells):
+                if round_number > 1 and not results[index]:
+                    continue  # Unsupported
+                result = executor.submit(run_cell, algorithm, heuristic, puzzles, settings["repeats"],
+                                         settings["warmup"], budget).result()
+                label = cell_label(algorithm, heuristic, bucket)
+                progress = f"[{round_number}/{rounds}] [{index + 1}/{len(cells)}] {label}"
+                if result is None:
+                    print(f"{progress}: unsupported, skipped")
+                    continue
+                results[index].append(result)
+                print(f"{progress}: {sum(run['time_taken'] for board in result[0] for run in board):.3f}s")
+
+    for index, (algorithm, heuristic, bucket, puzzles) in enumerate(cells):
+        if not results[index]:
+            continue
+        cell = summarize(algorithm, heuristic, bucket, puzzles, results[index])
+        document["cells"].append(cell)
+        print(f"{cell_label(algorithm, heuristic, bucket)}: solved {cell['solved']:.0%}, "
+              f"median {cell['time_median']:.4f}s, p95 {cell['time_p95']:.4f}s, noise {cell['time_noise']:.1%}, "
+              f"{cell['nodes_per_second'] or 0:,} nodes/s")
+    return document
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every algorithm and heuristic on seeded instance sets")
+    parser.add_argument('--suite', choices=SUITES, default="quick", help='Instance sets and default settings')
+    parser.add_argument('--algorithm', type=lambda value: parse_names(value, list(ALGORITHMS), "algorithm"),
+                        default=list(ALGORITHMS), help='Comma list of algorithms, or all (default)')
+    parser.add_argument('--heuristic', type=lambda value: parse_names(value, heuristic_names(), "heuristic"),
+                        help=f"Comma list of {', '.join(heuristic_names())}, or all "
+                             f"(default: every heuristic but none)")
+    parser.add_argument('--sets', type=lambda value: parse_names(value, list(INSTANCE_SETS), "instance set"),
+                        help="Comma list of instance sets (default: the suite's)")
+    parser.add_argument('--limit', type=int, help='Boards per bucket (default: the suite\'s; 0 for all)')
+    parser.add_argument('--processes', type=int, help='Fresh processes (rounds) per cell')
+    parser.add_argument('--repeats', type=int, help='Timed runs per board in each process')
+    parser.add_argument('--warmup', type=int, help='Untimed runs per cell before the timed ones')
+    parser.add_argument('--max-time', type=float, help='Budget per run in seconds')
+    parser.add_argument('--max-memory', type=int, default=4096, help='Budget per run in MiB of resident memory')
+    parser.add_argument('--output', type=str, help='Results file (default: data/benchmarks/results/<suite>-<time>.json)')
+    args = parser.parse_args()
+
+    settings = dict(SUITES[args.suite])
+    for option in ("sets", "limit", "processes", "repeats", "warmup", "max_time"):
+        if getattr(args, option) is not None:
+            settings[option] = getattr(args, option)
+    settings["limit"] = settings["limit"] or None
+    settings["max_memory"] = args.max_memory
+    if settings["repeats"] < 1 or settings["processes"] < 1:
+        parser.error("--repeats and --processes must be at least 1")
+
+    if args.heuristic:
+        heuristics = [None if name == "none" else name for name in args.heuristic]
+    else:
+        heuristics = [name for name in HEURISTICS if name]
+    algorithms = args.algorithm
+    if args.heuristic and not set(algorithms) & INFORMED_ALGORITHMS:
+        print("Note: none of the selected algorithms uses a heuristic")
+
+    document = run_suite(args.suite, algorithms, heuristics, settings)
+
+    output_file = args.output or os.path.join(RESULTS_DIR, f"{args.suite}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"Saved {len(document['cells'])} cells to {output_file}")
+
+
+if __name__ == '__main__':
+    main()
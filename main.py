@@ -4,6 +4,8 @@
 """ Accepts CLI arguments:
 python main.py --input data/input/example.json --algorithm bfs
 python main.py --all --algorithm a_star --heuristic manhattan
+python main.py --all --algorithm all --heuristic manhattan,pdb
+python main.py --input data/input/batch.jsonl --algorithm a_star --heuristic pdb --jobs 8
 """
 
 
@@ -11,9 +13,21 @@ import json
 import os
 import argparse
 import time
+import signal
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 from utils.validate import is_solvable
-from algorithms import bfs, dfs, a_star, ucs, ids, bi_bfs
+from utils.state import pack
+from utils.heuristics import HEURISTICS as HEURISTIC_REGISTRY, heuristic_names
+from utils.priority_queue import OPEN_LISTS
+from utils.closed_set import CLOSED_SETS
+from utils.solution_cache import SolutionCache, solution_key
+from utils.output_format import dump_output, output_line
+from utils.budget import Budget, CANCELLED
+from utils.errors import UnsupportedError
+from utils.distance_table import load_distance_table, MAX_SIZE as ORACLE_MAX_SIZE
+from algorithms import bfs, dfs, a_star, ucs, ids, bi_bfs, ida_star, mm, oracle
 
 ALGORITHMS = {
     "bfs": bfs.solve,
@@ -22,77 +36,390 @@ ALGORITHMS = {
     "ucs": ucs.solve,
     "bi_bfs": bi_bfs.solve,
     "a_star": a_star.solve,
+    "ida_star": ida_star.solve,
+    "mm": mm.solve,
+    "oracle": oracle.solve,
 }
 
-HEURISTICS = ["manhattan", None]
+HEURISTICS = list(HEURISTIC_REGISTRY)
+
+# Solvers that use the heuristic argument; others record heuristic as None
+INFORMED_ALGORITHMS = {"a_star", "ida_star", "mm"}
+
+# Solvers that accept an open_list option (see utils/priority_queue.OPEN_LISTS)
+OPEN_LIST_ALGORITHMS = {"ucs", "a_star"}
+
+# Solvers that accept a closed_set backend (see utils/closed_set.make_closed_set)
+CLOSED_SET_ALGORITHMS = {"bfs", "dfs", "ucs", "a_star", "bi_bfs", "mm"}
+
+# Shared by every run in this process; pass cache=None to run_solver to always solve
+SOLUTION_CACHE = SolutionCache()
 
 def load_input(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def save_output(output_path, data):
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=4)
-
-def run_solver(input_file, algorithm_name, heuristic):
-    input_data = load_input(input_file)
+def make_puzzle(input_data, default_name):
+    """Puzzle fields of one input record, with solvability checked once for every run on it."""
     initial = input_data["initial_state"]
-    goal = input_data["goal_state"]
     size = input_data["size"]
-    name = input_data.get("name", os.path.basename(input_file))
-
-    output = {
-        "puzzle_name": name,
+    return {
+        "name": input_data.get("name", default_name),
         "size": size,
         "initial_state": initial,
-        "goal_state": goal,
-        "algorithm": algorithm_name,
-        "heuristic": heuristic if algorithm_name == "a_star" else None
+        "goal_state": input_data["goal_state"],
+        "solvable": is_solvable(initial, size)
     }
 
-    if not is_solvable(initial, size):
-        output.update({
-            "status": "Unsolvable",
-            "solution_path": [],
-            "solution_length": 0,
-            "time_taken": 0,
-            "space_used": 0,
-            "nodes_expanded": 0
-        })
-    else:
-        solve_fn = ALGORITHMS[algorithm_name]
-        result = solve_fn(initial, goal, size, heuristic)
-        output.update(result)
+def load_puzzle(input_file):
+    """Read an input file and check solvability once, so a sweep can reuse it for every run."""
+    return make_puzzle(load_input(input_file), os.path.basename(input_file))
+
+def iter_puzzles(jsonl_file):
+    """Lazily yield (line number, puzzle) from a file with one input record per line."""
+    stem = os.path.splitext(os.path.basename(jsonl_file))[0]
+    with open(jsonl_file, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield line_number, make_puzzle(json.loads(line), f"{stem}:{line_number}")
+
+def save_output(output_path, data, compact=False, include_path=True):
+    with open(output_path, 'w') as f:
+        dump_output(data, f, compact, include_path)
 
+class TaskLimitExceeded(Exception):
+    """Raised inside a solver when its task runs past the time limit."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+def empty_result(status, time_taken=0):
+    return {
+        "status": status,
+        "solution_path": [],
+        "solution_length": 0,
+        "time_taken": time_taken,
+        "space_used": 0,
+        "nodes_expanded": 0
+    }
+
+def output_header(puzzle, algorithm_name, heuristic):
+    """Fields every output record starts with, identifying the puzzle and the solver."""
+    return {
+        "puzzle_name": puzzle["name"],
+        "size": puzzle["size"],
+        "initial_state": puzzle["initial_state"],
+        "goal_state": puzzle["goal_state"],
+        "algorithm": algorithm_name,
+        "heuristic": heuristic if algorithm_name in INFORMED_ALGORITHMS else None
+    }
+
+def output_path(input_file, algorithm_name, heuristic):
     filename = os.path.splitext(os.path.basename(input_file))[0]
     suffix = f"_{algorithm_name}"
     if heuristic:
         suffix += f"_{heuristic}"
-    os.makedirs(os.path.join("data", "output"), exist_ok=True)
-    output_file = os.path.join("data", "output", f"{filename}{suffix}.json")
-    save_output(output_file, output)
-    print(f"Saved result to {output_file}")
+    return os.path.join("data", "output", f"{filename}{suffix}.json")
+
+def _raise_timeout(signum, frame):
+    raise TaskLimitExceeded("Timed out")
+
+def run_solver(input_file, algorithm_name, heuristic, open_list="heap", closed_set="auto", verbose=True,
+               timeout=None, puzzle=None, cache=SOLUTION_CACHE, compact=False, include_path=True, budget=None):
+    if puzzle is None:
+        puzzle = load_puzzle(input_file)
+    output = solve_puzzle(puzzle, algorithm_name, heuristic, open_list, closed_set, timeout, cache, budget)
+    if output["status"] == CANCELLED:
+        return output  # Nobody asked for this result any more; keep the previous file
+
+    output_file = output_path(input_file, algorithm_name, heuristic)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    save_output(output_file, output, compact, include_path)
+    if verbose:
+        print(f"Saved result to {output_file}" + (" (cached)" if output["cache_hit"] else ""))
+    return output
+
+def solve_puzzle(puzzle, algorithm_name, heuristic, open_list="heap", closed_set="auto", timeout=None,
+                 cache=SOLUTION_CACHE, budget=None):
+    """Solve a loaded puzzle and return the output record, without writing it anywhere.
+
+    budget holds Budget keyword arguments (max_time, max_nodes, max_memory, and for
+    in-process callers cancel and progress). It is left out of the cache key: only
+    finished searches are cached, and those do not depend on the budget.
+    """
+    initial = puzzle["initial_state"]
+    goal = puzzle["goal_state"]
+    size = puzzle["size"]
+    output = output_header(puzzle, algorithm_name, heuristic)
+
+    if not puzzle["solvable"]:
+        output.update(empty_result("Unsolvable"))
+        cache_hit = False
+    else:
+        solve_fn = ALGORITHMS[algorithm_name]
+        options = {}
+        if algorithm_name in OPEN_LIST_ALGORITHMS:
+            options["open_list"] = open_list
+        if algorithm_name in CLOSED_SET_ALGORITHMS:
+            options["closed_set"] = closed_set
+        key = solution_key(initial, goal, size, algorithm_name, output["heuristic"], options)
+        result = cache.get(key) if cache is not None else None
+        cache_hit = result is not None
+        if result is None:
+            result = _solve(solve_fn, initial, goal, size, heuristic, options, timeout, budget)
+            if cache is not None:
+                cache.put(key, result)
+        output.update(result)
+    output["cache_hit"] = cache_hit
+    return output
+
+def _solve(solve_fn, initial, goal, size, heuristic, options, timeout=None, budget=None):
+    """Run one solver on list states, turning a time or memory overrun into a result."""
+    if budget:
+        options = {**options, "budget": Budget(**budget)}
+    start_time = time.perf_counter()
+    if timeout:  # SIGALRM only reaches the main thread, which is where pool workers run tasks
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        # Solvers work on packed int states; lists only exist at the JSON boundary
+        return solve_fn(pack(initial, size), pack(goal, size), size, heuristic, **options)
+    except TaskLimitExceeded as exc:
+        return empty_result(exc.status, round(time.perf_counter() - start_time, 6))
+    except MemoryError:
+        return empty_result("Memory limit exceeded", round(time.perf_counter() - start_time, 6))
+    except UnsupportedError as exc:  # The solver or heuristic does not support this board, e.g. oracle on 4x4
+        result = empty_result("Unsupported")
+        result["error"] = str(exc)
+        return result
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _init_worker(memory_limit):
+    """Cap the address space of a pool worker, in MiB, where the platform allows it."""
+    if memory_limit:
+        try:
+            import resource
+        except ImportError:
+            return
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def sweep_tasks(input_files, algorithms, heuristics):
+    """(input file, algorithm, heuristic) tasks of a sweep.
+
+    Uninformed solvers ignore the heuristic, so they run once per puzzle: with the
+    heuristic when only one was asked for (its name stays in the output file name,
+    as in a single run), else without.
+    """
+    return [(input_file, algorithm_name, heuristic)
+            for input_file in input_files
+            for algorithm_name in algorithms
+            for heuristic in task_heuristics(algorithm_name, heuristics)]
+
+def task_heuristics(algorithm_name, heuristics):
+    if algorithm_name in INFORMED_ALGORITHMS:
+        return heuristics
+    return [heuristics[0] if len(heuristics) == 1 else None]
+
+def load_puzzles(tasks):
+    """Load and validate every input file of the tasks once."""
+    return {input_file: load_puzzle(input_file) for input_file in dict.fromkeys(task[0] for task in tasks)}
+
+def run_sweep(tasks, open_list="heap", closed_set="auto", use_cache=True, output_options=None, budget=None):
+    """Solve tasks one after another in this process.
+
+    Puzzles are loaded once, and move tables, heuristic tables and pattern
+    databases stay cached between runs.
+    """
+    puzzles = load_puzzles(tasks)
+    cache = SOLUTION_CACHE if use_cache else None
+    return [run_solver(input_file, algorithm_name, heuristic, open_list, closed_set,
+                       puzzle=puzzles[input_file], cache=cache, budget=budget, **(output_options or {}))
+            for input_file, algorithm_name, heuristic in tasks]
+
+def run_batch(tasks, jobs, timeout=None, memory_limit=None, open_list="heap", closed_set="auto", use_cache=True,
+              output_options=None, budget=None):
+    """Solve (input file, algorithm, heuristic) tasks over a pool of jobs processes.
+
+    Each result is written by run_solver exactly as in a serial run and reported as
+    soon as it completes. timeout is in seconds and memory_limit in MiB per worker.
+    """
+    puzzles = load_puzzles(tasks)
+    # Workers use their own SOLUTION_CACHE; the on-disk store is shared between them
+    solve_options = {"budget": budget} if use_cache else {"cache": None, "budget": budget}
+    outputs = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(memory_limit,)) as pool:
+        futures = {pool.submit(run_solver, *task, open_list=open_list, closed_set=closed_set, verbose=False,
+                               timeout=timeout, puzzle=puzzles[task[0]], **solve_options,
+                               **(output_options or {})): task
+                   for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            input_file, algorithm_name, heuristic = futures[future]
+            output_file = output_path(input_file, algorithm_name, heuristic)
+            try:
+                output = future.result()
+            except Exception as exc:  # The worker died, e.g. killed for exceeding the memory cap
+                print(f"[{done}/{len(tasks)}] {output_file}: failed ({exc!r})")
+                continue
+            outputs.append(output)
+            print(f"[{done}/{len(tasks)}] Saved result to {output_file} "
+                  f"({output['status']}, {output['time_taken']}s{', cached' if output['cache_hit'] else ''})", flush=True)
+    return outputs
+
+def run_stream(input_file, output_file, algorithms, heuristics, jobs=1, timeout=None, memory_limit=None,
+               open_list="heap", closed_set="auto", use_cache=True, output_options=None, budget=None):
+    """Solve every record of a JSONL input and append each output record to one JSONL file.
+
+    Puzzles are read lazily and at most 2 * jobs runs are in flight, so memory stays
+    flat however long the input is. Records are written in completion order and
+    carry the input_line they came from.
+    """
+    solve_options = {"budget": budget} if use_cache else {"cache": None, "budget": budget}
+    tasks = ((line_number, puzzle, algorithm_name, heuristic)
+             for line_number, puzzle in iter_puzzles(input_file)
+             for algorithm_name in algorithms
+             for heuristic in task_heuristics(algorithm_name, heuristics))
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    written = 0
+
+    with open(output_file, 'w') as out:
+        def write(line_number, output):
+            nonlocal written
+            output["input_line"] = line_number
+            out.write(output_line(output, **(output_options or {})) + "\n")
+            out.flush()
+            written += 1
+
+        if jobs <= 1 and not memory_limit:
+            for line_number, puzzle, algorithm_name, heuristic in tasks:
+                write(line_number, solve_puzzle(puzzle, algorithm_name, heuristic, open_list, closed_set,
+                                                timeout, **solve_options))
+        else:
+            def new_pool():
+                return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(memory_limit,))
+
+            def finish(future):
+                line_number, puzzle, algorithm_name, heuristic = pending.pop(future)
+                try:
+                    output = future.result()
+                except Exception as exc:  # The worker died, e.g. killed for exceeding the memory cap
+                    output = {**output_header(puzzle, algorithm_name, heuristic), **empty_result("Failed"),
+                              "error": repr(exc), "cache_hit": False}
+                write(line_number, output)
+
+            pending = {}
+            pool = new_pool()
+            try:
+                for task in tasks:
+                    line_number, puzzle, algorithm_name, heuristic = task
+                    try:
+                        future = pool.submit(solve_puzzle, puzzle, algorithm_name, heuristic, open_list,
+                                             closed_set, timeout, **solve_options)
+                    except BrokenProcessPool:
+                        # A dead worker breaks the whole pool; its runs in flight fail, the rest go on
+                        pool.shutdown()
+                        pool = new_pool()
+                        future = pool.submit(solve_puzzle, puzzle, algorithm_name, heuristic, open_list,
+                                             closed_set, timeout, **solve_options)
+                    pending[future] = task
+                    if len(pending) >= 2 * jobs:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finish(future)
+                for future in as_completed(list(pending)):
+                    finish(future)
+            finally:
+                pool.shutdown()
+
+    print(f"Saved {written} results to {output_file}")
+    return written
+
+def precompute(puzzles):
+    """Build the exhaustive distance table of every small-board goal among the puzzles."""
+    for puzzle in puzzles:
+        size = puzzle["size"]
+        if size <= ORACLE_MAX_SIZE:
+            load_distance_table(pack(puzzle["goal_state"], size), size)
+    print("Distance tables ready")
+
+def parse_names(value, choices, option):
+    """Split a comma list of names; 'all' selects every choice."""
+    if value == "all":
+        return list(choices)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in choices]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"invalid {option} {', '.join(unknown) or repr(value)} (choose from {', '.join(choices)}, or all)")
+    return names
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('--input', type=str, help='Path to input file')
+    parser.add_argument('--input', type=str, help='Path to input file, or a .jsonl file of puzzles to stream')
+    parser.add_argument('--output', type=str, help='Results file when streaming a .jsonl input')
     parser.add_argument('--all', action='store_true', help='Run on all input files')
-    parser.add_argument('--algorithm', choices=ALGORITHMS.keys(), required=True)
-    parser.add_argument('--heuristic', choices=["manhattan", "none"], default="none")
+    parser.add_argument('--algorithm',
+                        type=lambda value: parse_names(value, list(ALGORITHMS), "algorithm"),
+                        help=f"Comma list of {', '.join(ALGORITHMS)}, or all")
+    parser.add_argument('--heuristic', default=["none"],
+                        type=lambda value: parse_names(value, heuristic_names(), "heuristic"),
+                        help=f"Comma list of {', '.join(heuristic_names())}, or all")
+    parser.add_argument('--open-list', choices=OPEN_LISTS.keys(), default="heap", help='Open list used by ucs and a_star')
+    parser.add_argument('--closed-set', choices=["auto", *CLOSED_SETS], default="auto", help='Visited-set backend')
+    parser.add_argument('--precompute', action='store_true',
+                        help='Build the oracle distance tables for the goals of the inputs and exit')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write results on one line with the path packed as a move string')
+    parser.add_argument('--no-path', action='store_true', help='Leave solution_path out of the results')
+    parser.add_argument('--no-cache', action='store_true', help='Solve again even if a cached result exists')
+    parser.add_argument('--max-time', type=float, help='Solver budget in seconds; ends with status "Budget exceeded"')
+    parser.add_argument('--max-nodes', type=int, help='Solver budget in nodes expanded')
+    parser.add_argument('--max-memory', type=int, help='Solver budget in MiB of resident memory')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for --all')
+    parser.add_argument('--timeout', type=float, help='Per-task time limit in seconds, with --jobs')
+    parser.add_argument('--memory-limit', type=int, help='Per-worker memory cap in MiB, with --jobs')
     args = parser.parse_args()
+    if not args.algorithm and not args.precompute:
+        parser.error("the following arguments are required: --algorithm")
+
+    heuristics = [None if name == "none" else name for name in args.heuristic]
+    output_options = {"compact": args.compact, "include_path": not args.no_path}
+    budget = {"max_time": args.max_time, "max_nodes": args.max_nodes, "max_memory": args.max_memory}
+    budget = {name: limit for name, limit in budget.items() if limit} or None
 
-    heuristic = None if args.heuristic == "none" else args.heuristic
+    if args.input and args.input.endswith(".jsonl"):
+        if args.precompute:
+            precompute(puzzle for _, puzzle in iter_puzzles(args.input))
+            return
+        stem = os.path.splitext(os.path.basename(args.input))[0]
+        output_file = args.output or os.path.join("data", "output", f"{stem}_results.jsonl")
+        run_stream(args.input, output_file, args.algorithm, heuristics, max(args.jobs, 1), args.timeout,
+                   args.memory_limit, args.open_list, args.closed_set, not args.no_cache, output_options, budget)
+        return
 
     if args.all:
         input_dir = os.path.join("data", "input")
-        for file_name in os.listdir(input_dir):
-            if file_name.endswith(".json"):
-                run_solver(os.path.join(input_dir, file_name), args.algorithm, heuristic)
+        input_files = [os.path.join(input_dir, file_name)
+                       for file_name in sorted(os.listdir(input_dir)) if file_name.endswith(".json")]
     else:
         if not args.input:
             print("Please provide --input file or use --all")
             return
-        run_solver(args.input, args.algorithm, heuristic)
+        input_files = [args.input]
+
+    if args.precompute:
+        precompute(load_puzzles([(input_file,) for input_file in input_files]).values())
+        return
+
+    tasks = sweep_tasks(input_files, args.algorithm, heuristics)
+    if args.jobs > 1 or args.timeout or args.memory_limit:
+        run_batch(tasks, max(args.jobs, 1), args.timeout, args.memory_limit, args.open_list, args.closed_set,
+                  not args.no_cache, output_options, budget)
+    else:
+        run_sweep(tasks, args.open_list, args.closed_set, not args.no_cache, output_options, budget)
 
 if __name__ == '__main__':
     main()
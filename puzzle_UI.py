@@ -6,17 +6,18 @@ import json
 import os
 import sys
 import time
-import threading
 
 # Add the current directory to the path
 sys.path.append('.')
 
-from main import run_solver, ALGORITHMS, HEURISTICS
+from main import ALGORITHMS, HEURISTICS
+from utils.output_format import expand_output
 from ui.constants import *
 from ui.components import ModernButton, ModernSlider
 from ui.dropdown import ModernScrollableDropdown
 from ui.puzzle_renderer import PuzzleRenderer
 from ui.panels import StatisticsPanel, MoveListPanel, ProgressPanel
+from ui.solver_worker import SolverWorker
 
 
 class ModernPuzzleGUI:
@@ -48,6 +49,10 @@ class ModernPuzzleGUI:
         self.animation_speed = 2.0
         self.last_move_time = 0
         self.solving = False
+        self.progress_event = None  # Latest progress event of the running solve
+        
+        # Solves run in a separate process, so a long search cannot starve the render loop
+        self.solver = SolverWorker()
         
         # Enhanced move visualization
         self.move_history = []
@@ -63,8 +68,8 @@ class ModernPuzzleGUI:
         # Move list panel - positioned on the right side
         self.move_list_panel = MoveListPanel(CONTROL_AREA.x + 400, CONTROL_AREA.y + 100, 350, 400)
         
-        # Progress panel - positioned between slider and statistics
-        self.progress_panel = ProgressPanel(CONTROL_AREA.x + 20, CONTROL_AREA.y + 520)
+        # Progress panel - takes the place of the statistics card while a solve runs
+        self.progress_panel = ProgressPanel(CONTROL_AREA.x + 20, CONTROL_AREA.y + 600)
         
         # UI Elements
         self._create_ui_elements()
@@ -104,7 +109,7 @@ class ModernPuzzleGUI:
         # Heuristic dropdown
         self.heuristic_dropdown = ModernScrollableDropdown(
             x, y + 40, 300, 40,
-            ["None", "manhattan"],
+            ["None"] + [name for name in HEURISTICS if name],
             max_visible=4        )
         y += 120
         
@@ -126,6 +131,7 @@ class ModernPuzzleGUI:
         if not filename:
             return
             
+        self.cancel_solve()
         input_path = os.path.join("data", "input", filename)
         try:
             with open(input_path, 'r') as f:
@@ -141,7 +147,6 @@ class ModernPuzzleGUI:
             self.solution_data = None
               # Reset UI state
             self.is_auto_solving = False
-            self.solving = False
             self.move_history = []
             self.current_move_highlight = None
             
@@ -149,86 +154,71 @@ class ModernPuzzleGUI:
             print(f"Error loading puzzle: {e}")
     
     def solve_puzzle(self):
-        """Solve the current puzzle and automatically start animation"""
+        """Solve the current puzzle in the worker process; update() starts the animation"""
         if self.solving or not self.current_input_file:
             return
         
+        input_file = self.current_input_file
+        algorithm = self.current_algorithm
+        heuristic = self.current_heuristic if self.current_heuristic != "None" else None
+        
+        print(f"=== STARTING SOLVER ===")
+        print(f"Input file: {input_file}")
+        print(f"Algorithm: {algorithm}")
+        print(f"Heuristic: {heuristic}")
+        
         self.is_auto_solving = False
         self.solving = True
-        self.play_button.text = "Solving..."
-        
-        def solve_thread():
-            try:
-                input_file = self.current_input_file
-                algorithm = self.current_algorithm
-                heuristic = self.current_heuristic if self.current_heuristic != "None" else None
-                
-                print(f"=== STARTING SOLVER ===")
-                print(f"Input file: {input_file}")
-                print(f"Algorithm: {algorithm}")
-                print(f"Heuristic: {heuristic}")
-                
-                # Run solver
-                input_path = f"data/input/{input_file}"
-                run_solver(input_path, algorithm, heuristic)
-                
-                # Load result
-                output_path = self._get_output_path(input_file, algorithm, heuristic)
-                time.sleep(0.3)  # Wait for file to be written
-                
-                if os.path.exists(output_path):
-                    with open(output_path, 'r') as f:
-                        result_data = json.load(f)
-                    
-                    if result_data.get("status") == "Path found":
-                        self.solution_path = result_data["solution_path"]
-                        self.solution_data = result_data
-                        self.current_step = 0
-                        self.current_state = self.initial_state[:]
-                        self.move_history = []
-                        self.current_move_highlight = None
-                          # Start automatic animation
-                        self.is_auto_solving = True
-                        self.is_paused = False
-                        self.last_move_time = time.time()
-                        print(f"🚀 Starting animation with {len(self.solution_path)} steps!")
-                    else:
-                        self.solution_path = []
-                        self.solution_data = result_data
-                        print(f"❌ No solution found. Status: {result_data.get('status', 'Unknown')}")
-                else:
-                    print(f"❌ Output file not found: {output_path}")
-                    self.solution_data = {"status": "error", "error": "Output file not found"}
-                    
-            except Exception as e:
-                print(f"❌ Error in solve_thread: {e}")
-                self.solution_data = {"status": "error", "error": str(e)}
-            finally:
+        self.progress_event = None
+        self.play_button.text = "Cancel"
+        self.solver.submit(f"data/input/{input_file}", algorithm, heuristic)
+    
+    def cancel_solve(self):
+        """Stop the running solve; a solver that does not stop soon is killed"""
+        if not self.solving:
+            return
+        self.solver.cancel()
+        self.solving = False
+        self.play_button.text = "Play"
+        print("⏹ Solve cancelled")
+    
+    def _poll_solver(self):
+        """Apply progress and results the worker process has sent since the last frame"""
+        for kind, payload in self.solver.poll():
+            if kind == "progress":
+                self.progress_event = payload
+            elif kind == "result":
+                self._apply_result(expand_output(payload))
+            else:
+                print(f"❌ Error in solver: {payload}")
+                self.solution_data = {"status": "error", "error": payload}
                 self.solving = False
-                if self.is_auto_solving:
-                    self.play_button.text = "Pause"
-                else:
-                    self.play_button.text = "Play"
-        
-        thread = threading.Thread(target=solve_thread)
-        thread.daemon = True
-        thread.start()
+                self.play_button.text = "Play"
     
-    def _get_output_path(self, input_file, algorithm, heuristic):
-        """Generate output file path"""
-        filename = input_file.replace('.json', '')
-        
-        if algorithm == "a_star" and heuristic:
-            suffix = f"_a_star_{heuristic}"
-        elif algorithm == "a_star" and not heuristic:
-            suffix = "_a_star"
-        elif heuristic:
-            suffix = f"_{algorithm}_{heuristic}"
-        else:
-            suffix = f"_{algorithm}"
+    def _apply_result(self, result_data):
+        """Show a finished solve and start animating its path"""
+        self.solving = False
+        if result_data.get("cache_hit"):
+            print("⚡ Using cached solution")
         
-        output_filename = f"{filename}{suffix}.json"
-        return os.path.join("data", "output", output_filename)
+        if result_data.get("status") == "Path found":
+            self.solution_path = result_data["solution_path"]
+            self.solution_data = result_data
+            self.current_step = 0
+            self.current_state = self.initial_state[:]
+            self.move_history = []
+            self.current_move_highlight = None
+            # Start automatic animation
+            self.is_auto_solving = True
+            self.is_paused = False
+            self.last_move_time = time.time()
+            self.play_button.text = "Pause"
+            print(f"🚀 Starting animation with {len(self.solution_path)} steps!")
+        else:
+            self.solution_path = []
+            self.solution_data = result_data
+            self.play_button.text = "Play"
+            print(f"❌ No solution found. Status: {result_data.get('status', 'Unknown')}")
     
     def step_forward(self):
         """Move one step forward in the solution"""
@@ -294,6 +284,7 @@ class ModernPuzzleGUI:
     
     def reset_puzzle(self):
         """Reset puzzle to initial state"""
+        self.cancel_solve()
         self.current_state = self.initial_state[:]
         self.current_step = 0
         self.is_auto_solving = False
@@ -343,8 +334,10 @@ class ModernPuzzleGUI:
             if selected_file and selected_file != "No files":
                 self.load_puzzle(selected_file)
         elif dropdown == self.algorithm_dropdown:
+            self.cancel_solve()
             self.current_algorithm = self.algorithm_dropdown.get_selected()
         elif dropdown == self.heuristic_dropdown:
+            self.cancel_solve()
             self.current_heuristic = self.heuristic_dropdown.get_selected()
     def _handle_ui_events(self, event):
         """Handle UI events when no dropdown is open"""
@@ -355,7 +348,9 @@ class ModernPuzzleGUI:
         
         # Buttons
         if self.play_button.handle_event(event):
-            if not self.is_auto_solving and not self.solving:
+            if self.solving:
+                self.cancel_solve()
+            elif not self.is_auto_solving:
                 self.solve_puzzle()
             elif self.is_auto_solving:
                 # Toggle pause/resume
@@ -370,6 +365,7 @@ class ModernPuzzleGUI:
     
     def update(self, dt):
         """Update the application state"""
+        self._poll_solver()
         if self.is_auto_solving and self.solution_path and not self.is_paused:
             current_time = time.time()
             time_per_move = 1.0 / self.animation_speed
@@ -392,7 +388,10 @@ class ModernPuzzleGUI:
         
         # Draw panels (background layer)
         self._draw_labels()
-        self.statistics_panel.draw_statistics(self.screen, self.solution_data)
+        if self.solving:
+            self.progress_panel.draw_progress(self.screen, self.progress_event, self.current_algorithm)
+        else:
+            self.statistics_panel.draw_statistics(self.screen, self.solution_data)
         self.move_list_panel.draw_move_list(
             self.screen, self.solution_path, self.current_step, 
             self.current_move_highlight, self.show_move_list
@@ -436,6 +435,7 @@ class ModernPuzzleGUI:
             self.update(dt)
             self.draw()
         
+        self.solver.close()
         pygame.quit()
 
 
@@ -1,41 +1,145 @@
 # report.py
 import os
-import json
 import csv
+import json
+import argparse
 
 OUTPUT_DIR = os.path.join("data", "output")
 REPORT_FILE = "data/report.csv"
+# {"report": [mtime_ns, size] of the CSV written, "outputs": output file name -> [mtime_ns, size, rows]};
+# lets a run re-read only new or changed outputs
+INDEX_FILE = "data/report_index.json"
 
 HEADERS = [
     "puzzle_name", "size", "algorithm", "heuristic", "status",
     "solution_length", "time_taken", "space_used", "nodes_expanded"
 ]
 
-def load_outputs():
-    reports = []
-    for filename in os.listdir(OUTPUT_DIR):
-        if filename.endswith(".json"):
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                report = {key: data.get(key, None) for key in HEADERS}
-                reports.append(report)
-    return reports
-
-def write_csv(reports):
+PATH_KEY = b'"solution_path"'
+
+
+def skip_path(text):
+    """Cut the solution_path value out of a JSON record so only the header fields get parsed.
+
+    Paths are lists of move letters or one move string (see utils/output_format.py),
+    so the value ends at the first ']' or closing quote.
+    """
+    start = text.find(PATH_KEY)
+    if start < 0:
+        return text
+    value = text.index(b':', start + len(PATH_KEY)) + 1
+    while text[value] in b' \t\r\n':
+        value += 1
+    if text[value] == ord('['):
+        end = text.index(b']', value) + 1
+    elif text[value] == ord('"'):
+        end = text.index(b'"', value + 1) + 1
+    else:
+        return text
+    return text[:start] + PATH_KEY + b':null' + text[end:]
+
+
+def read_rows(filepath):
+    """Report rows of one output file: a single JSON result, or a JSONL stream of them."""
+    with open(filepath, 'rb') as f:
+        if filepath.endswith(".jsonl"):
+            records = [json.loads(skip_path(line)) for line in f if line.strip()]
+        else:
+            records = [json.loads(skip_path(f.read()))]
+    return [[record.get(key) for key in HEADERS] for record in records]
+
+
+def file_stamp(path):
+    """[mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_index():
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(index):
+    os.makedirs(os.path.dirname(INDEX_FILE), exist_ok=True)
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(index, separators=(",", ":")))  # dumps uses the C encoder, dump does not
+    os.replace(tmp_path, INDEX_FILE)
+
+
+def update_index(index):
+    """Refresh index against OUTPUT_DIR.
+
+    Return (new index, rows of files not seen before, whether any indexed file
+    changed or disappeared). Only new or changed files are opened.
+    """
+    updated = {}
+    added = []
+    changed = False
+    with os.scandir(OUTPUT_DIR) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if not entry.name.endswith((".json", ".jsonl")):
+                continue
+            stat = entry.stat()
+            previous = index.get(entry.name)
+            if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                updated[entry.name] = previous
+                continue
+            rows = read_rows(entry.path)
+            updated[entry.name] = [stat.st_mtime_ns, stat.st_size, rows]
+            if previous:
+                changed = True
+            else:
+                added.extend(rows)
+    changed = changed or any(name not in updated for name in index)
+    return updated, added, changed
+
+
+def write_csv(rows, append=False):
     os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
-    with open(REPORT_FILE, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=HEADERS)
-        writer.writeheader()
-        writer.writerows(reports)
-    print(f"Report written to {REPORT_FILE}")
+    with open(REPORT_FILE, 'a' if append else 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        if not append:
+            writer.writerow(HEADERS)
+        writer.writerows(rows)
+
 
 def main():
-    reports = load_outputs()
-    if not reports:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the index and re-read every output')
+    args = parser.parse_args()
+
+    if not os.path.isdir(OUTPUT_DIR):
+        print("No output files found.")
+        return
+    # Appending is only safe when the CSV on disk is the one the index describes; one that was
+    # edited, truncated or replaced since has another mtime or size, and is rebuilt
+    index = {} if args.rebuild else load_index()
+    report = file_stamp(REPORT_FILE)
+    outputs = index.get("outputs", {}) if report is not None and index.get("report") == report else {}
+    rewrite = not outputs
+    outputs, added, changed = update_index(outputs)
+    if not outputs:
         print("No output files found.")
         return
-    write_csv(reports)
+
+    if rewrite or changed:
+        write_csv([row for _, _, rows in outputs.values() for row in rows])
+        print(f"Report written to {REPORT_FILE}")
+    elif added:
+        write_csv(added, append=True)
+        print(f"Appended {len(added)} rows to {REPORT_FILE}")
+    else:
+        print(f"{REPORT_FILE} is up to date")
+        return
+    save_index({"report": file_stamp(REPORT_FILE), "outputs": outputs})
 
 if __name__ == '__main__':
     main()
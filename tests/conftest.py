@@ -0,0 +1,14 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Tables and caches live under data/, relative to the repository root."""
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,32 @@
+# tests/test_a_star.py
+import pytest
+
+from algorithms import a_star, ida_star
+from utils.budget import Budget
+from utils.state import pack
+
+GOAL_4X4 = list(range(1, 16)) + [0]
+
+# Boards where closing states at generation made A* with the (inconsistent) pdb heuristic miss the optimum
+PDB_BOARDS = [
+    [5, 3, 8, 7, 2, 1, 4, 12, 10, 6, 13, 0, 14, 15, 11, 9],
+    [1, 10, 3, 12, 9, 5, 4, 7, 13, 0, 14, 8, 11, 6, 2, 15],
+]
+
+
+@pytest.mark.parametrize("open_list", ["heap", "bucket"])
+@pytest.mark.parametrize("board", PDB_BOARDS)
+def test_pdb_path_is_as_short_as_ida_star(board, open_list):
+    initial, goal = pack(board, 4), pack(GOAL_4X4, 4)
+    reference = ida_star.solve(initial, goal, 4, "pdb")
+    result = a_star.solve(initial, goal, 4, "pdb", open_list=open_list)
+    assert result["status"] == reference["status"] == "Path found"
+    assert result["solution_length"] == reference["solution_length"]
+
+
+@pytest.mark.parametrize("heuristic", ["manhattan", "pdb"])
+def test_budget_lower_bound_is_admissible(heuristic):
+    initial, goal = pack(PDB_BOARDS[0], 4), pack(GOAL_4X4, 4)
+    result = a_star.solve(initial, goal, 4, heuristic, budget=Budget(max_nodes=200))
+    assert result["status"] == "Budget exceeded"
+    assert result["lower_bound"] <= 35
@@ -0,0 +1,37 @@
+# tests/test_benchmark_compare.py
+import subprocess
+import sys
+
+from benchmarks.compare import compare_cell
+
+
+def run_benchmark(output):
+    subprocess.run([sys.executable, "-m", "benchmarks.run", "--sets", "depth_3x3", "--limit", "1",
+                    "--algorithm", "a_star,bfs", "--heuristic", "manhattan", "--processes", "2",
+                    "--repeats", "1", "--output", str(output)], check=True, capture_output=True)
+
+
+def test_same_tree_does_not_regress(tmp_path):
+    """A/A: two runs of the unchanged tree must pass the gate."""
+    baseline, candidate = tmp_path / "baseline.json", tmp_path / "candidate.json"
+    run_benchmark(baseline)
+    run_benchmark(candidate)
+    result = subprocess.run([sys.executable, "-m", "benchmarks.compare", str(baseline), str(candidate)],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout
+
+
+def cell(board_times, time_noise=0.02):
+    return {"algorithm": "bfs", "heuristic": None, "bucket": "3x3/d16-23", "time_noise": time_noise,
+            "board_times": board_times, "board_work": [t / 0.02 for t in board_times],
+            "board_nodes": [1000] * len(board_times), "solved": 1.0, "optimal": 1.0}
+
+
+def test_consistent_slowdown_regresses():
+    _, regressions = compare_cell(cell([0.5, 0.6, 0.7]), cell([1.0, 1.2, 1.4]))
+    assert "time" in regressions
+
+
+def test_fast_boards_do_not_gate():
+    deltas, regressions = compare_cell(cell([0.001, 0.002]), cell([0.004, 0.008]))
+    assert not deltas["gated"] and regressions == []
@@ -0,0 +1,46 @@
+# tests/test_bi_bfs.py
+import random
+
+import pytest
+
+from algorithms import bfs, bi_bfs
+from utils.move import get_move_table
+from utils.state import blank_index, pack
+from utils.validate import is_solvable
+
+GOAL_3X3 = pack([1, 2, 3, 4, 5, 6, 7, 8, 0], 3)
+
+
+def random_boards(count, seed=7):
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        tiles = list(range(9))
+        rng.shuffle(tiles)
+        if is_solvable(tiles, 3):
+            boards.append(pack(tiles, 3))
+    return boards
+
+
+def replay(state, path, size):
+    """State reached by playing path, whose actions move the blank."""
+    moves = get_move_table(size)
+    for action in path:
+        blank = blank_index(state, size)
+        target = next(target for name, target, _, _ in moves.moves_from(blank) if name == action)
+        state = moves.apply(state, blank, target)
+    return state
+
+
+@pytest.fixture(scope="module")
+def shortest():
+    """Board -> BFS solution length, for 8 random boards."""
+    return {initial: bfs.solve(initial, GOAL_3X3, 3)["solution_length"] for initial in random_boards(8)}
+
+
+@pytest.mark.parametrize("closed_set", ["set", "hash", "bitmap"])
+def test_paths_are_shortest_and_reach_the_goal(shortest, closed_set):
+    for initial, length in shortest.items():
+        result = bi_bfs.solve(initial, GOAL_3X3, 3, closed_set=closed_set)
+        assert result["solution_length"] == length
+        assert replay(initial, result["solution_path"], 3) == GOAL_3X3
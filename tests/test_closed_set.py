@@ -0,0 +1,44 @@
+# tests/test_closed_set.py
+import pytest
+
+from main import make_puzzle, solve_puzzle
+from utils.closed_set import PermutationBitmap, make_closed_set
+from utils.errors import UnsupportedError
+from utils.state import pack
+
+GOAL_4X4 = list(range(1, 16)) + [0]
+
+
+def test_bitmap_refuses_4x4():
+    with pytest.raises(UnsupportedError):
+        PermutationBitmap(4)
+
+
+def test_bitmap_on_4x4_is_unsupported():
+    board = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 0, 15]
+    puzzle = make_puzzle({"size": 4, "initial_state": board, "goal_state": GOAL_4X4}, "one_move")
+    output = solve_puzzle(puzzle, "bfs", None, closed_set="bitmap", cache=None)
+    assert output["status"] == "Unsupported"
+
+
+@pytest.mark.parametrize("backend", ["set", "hash", "bitmap"])
+def test_backends_agree(backend):
+    goal, one_move = pack([1, 2, 3, 4, 5, 6, 7, 8, 0], 3), pack([1, 2, 3, 4, 5, 6, 7, 0, 8], 3)
+    closed = make_closed_set(3, backend)
+    assert closed.insert(goal) and not closed.insert(goal)
+    assert goal in closed and one_move not in closed
+    assert len(closed) == 1 and closed.nbytes() > 0
+
+
+@pytest.mark.parametrize("backend", ["set", "hash", "bitmap"])
+def test_discard_keeps_the_other_states(backend):
+    closed = make_closed_set(3, backend)
+    boards = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [1, 2, 3, 4, 5, 6, 7, 0, 8], [1, 2, 3, 4, 5, 0, 7, 8, 6],
+              [1, 2, 3, 4, 0, 5, 7, 8, 6], [1, 2, 3, 0, 4, 5, 7, 8, 6]]
+    states = [pack(board, 3) for board in boards]
+    for state in states:
+        closed.add(state)
+    closed.discard(states[1])
+    closed.discard(states[1])
+    assert len(closed) == 4 and states[1] not in closed
+    assert all(state in closed for state in states if state != states[1])
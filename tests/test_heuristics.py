@@ -0,0 +1,30 @@
+# tests/test_heuristics.py
+import random
+
+import pytest
+
+from utils.heuristics import HEURISTICS
+from utils.move import get_move_table
+from utils.state import blank_index, pack
+
+
+@pytest.mark.parametrize("size", [3, 4])
+@pytest.mark.parametrize("name", ["walking_distance", "pdb"])
+def test_update_matches_a_fresh_estimate(name, size):
+    """Incremental updates, with and without the parent remembered, agree with scoring from scratch."""
+    goal = pack(list(range(1, size * size)) + [0], size)
+    estimator = HEURISTICS[name](goal, size)
+    moves = get_move_table(size)
+    rng = random.Random(size)
+    for walk in range(6):
+        state, blank = goal, blank_index(goal, size)
+        h = estimator.estimate(state)
+        for step in range(150):
+            _, target, shift, delta = rng.choice(moves.moves_from(blank))
+            tile = (state >> shift) & moves.mask
+            state += tile * delta
+            if walk % 2 and step % 7 == 0:
+                estimator = HEURISTICS[name](goal, size)  # Remembers no state yet
+            h = estimator.update(h, state, tile, target, blank)
+            blank = target
+            assert h == HEURISTICS[name](goal, size).estimate(state)
@@ -0,0 +1,21 @@
+# tests/test_main.py
+import pytest
+
+from algorithms import oracle
+from main import _solve
+
+GOAL_3X3 = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+def test_size_limits_are_unsupported():
+    goal_4x4 = list(range(1, 16)) + [0]
+    result = _solve(oracle.solve, goal_4x4, goal_4x4, 4, None, {})
+    assert result["status"] == "Unsupported" and "3x3" in result["error"]
+
+
+def test_other_errors_propagate():
+    def broken_solve(initial_state, goal_state, size, heuristic):
+        raise ValueError("bug in the solver")
+
+    with pytest.raises(ValueError, match="bug in the solver"):
+        _solve(broken_solve, GOAL_3X3, GOAL_3X3, 3, None, {})
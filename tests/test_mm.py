@@ -0,0 +1,30 @@
+# tests/test_mm.py
+import pytest
+
+from algorithms import ida_star, mm
+from main import make_puzzle, solve_puzzle
+from utils.state import pack
+
+GOAL_3X3 = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+BOARDS = [
+    [8, 6, 7, 2, 5, 4, 3, 0, 1],
+    [6, 4, 7, 8, 5, 0, 3, 2, 1],
+    [1, 2, 3, 4, 5, 6, 0, 7, 8],
+]
+
+
+@pytest.mark.parametrize("closed_set", ["set", "hash", "bitmap"])
+@pytest.mark.parametrize("board", BOARDS)
+def test_paths_are_optimal_with_every_closed_set(board, closed_set):
+    initial, goal = pack(board, 3), pack(GOAL_3X3, 3)
+    reference = ida_star.solve(initial, goal, 3, "manhattan")
+    result = mm.solve(initial, goal, 3, "manhattan", closed_set=closed_set)
+    assert result["solution_length"] == reference["solution_length"]
+
+
+def test_closed_set_option_reaches_mm():
+    puzzle = make_puzzle({"size": 3, "initial_state": BOARDS[0], "goal_state": GOAL_3X3}, "hard")
+    bitmap = solve_puzzle(puzzle, "mm", "manhattan", closed_set="bitmap", cache=None)
+    hashed = solve_puzzle(puzzle, "mm", "manhattan", closed_set="hash", cache=None)
+    assert bitmap["solution_length"] == hashed["solution_length"] == 31
+    assert bitmap["space_used"] != hashed["space_used"]
@@ -0,0 +1,52 @@
+# tests/test_pdb.py
+import random
+
+import pytest
+
+from algorithms import a_star, ida_star
+from utils.distance_table import DistanceTable
+from utils.heuristics import make_heuristic
+from utils.move import get_move_table
+from utils.state import blank_index, pack
+
+
+def goal_state(size):
+    return pack(list(range(1, size * size)) + [0], size)
+
+
+def walk(size, seed, length):
+    """Board reached from the goal by a seeded random walk."""
+    moves = get_move_table(size)
+    rng = random.Random(seed)
+    state, blank, last_action = goal_state(size), size * size - 1, None
+    for _ in range(length):
+        last_action, state, blank = rng.choice(moves.neighbors(state, blank, last_action))
+    return state
+
+
+def test_4x4_pdb_is_flagged_inconsistent():
+    goal = goal_state(4)
+    pdb = make_heuristic("pdb", goal, 4)
+    state = pack([1, 2, 3, 6, 0, 10, 7, 4, 5, 11, 8, 12, 14, 9, 13, 15], 4)
+    child = dict((action, child) for action, child, _ in get_move_table(4).neighbors(state, blank_index(state, 4)))["U"]
+    assert pdb.estimate(child) - pdb.estimate(state) > 1
+    assert not pdb.consistent
+
+
+def test_3x3_pdb_is_exact():
+    goal = goal_state(3)
+    pdb, oracle = make_heuristic("pdb", goal, 3), DistanceTable(goal, 3)
+    assert pdb.consistent
+    for seed in range(20):
+        state = walk(3, seed, 40)
+        assert pdb.estimate(state) == oracle.estimate(state)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_a_star_pdb_is_optimal_on_4x4(seed):
+    state, goal = walk(4, seed, 36), goal_state(4)
+    reference = ida_star.solve(state, goal, 4, "pdb")
+    result = a_star.solve(state, goal, 4, "pdb")
+    assert result["status"] == reference["status"] == "Path found"
+    assert result["solution_length"] == reference["solution_length"]
+    assert make_heuristic("pdb", goal, 4).estimate(state) <= reference["solution_length"]
@@ -0,0 +1,50 @@
+# tests/test_report.py
+import csv
+import json
+import sys
+
+import pytest
+
+import report
+
+
+@pytest.fixture
+def report_files(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setattr(report, "OUTPUT_DIR", str(output_dir))
+    monkeypatch.setattr(report, "REPORT_FILE", str(tmp_path / "report.csv"))
+    monkeypatch.setattr(report, "INDEX_FILE", str(tmp_path / "report_index.json"))
+    monkeypatch.setattr(sys, "argv", ["report.py"])
+    return output_dir, tmp_path / "report.csv"
+
+
+def write_output(output_dir, name):
+    record = {"puzzle_name": name, "size": 3, "algorithm": "bfs", "heuristic": None, "status": "Path found",
+              "solution_length": 2, "solution_path": ["L", "U"], "time_taken": 0.001, "space_used": 10,
+              "nodes_expanded": 5}
+    (output_dir / f"{name}.json").write_text(json.dumps(record))
+
+
+def report_names(report_file):
+    with open(report_file, newline='') as f:
+        return [row[0] for row in csv.reader(f)][1:]
+
+
+def test_new_outputs_are_appended(report_files):
+    output_dir, report_file = report_files
+    write_output(output_dir, "a")
+    report.main()
+    write_output(output_dir, "b")
+    report.main()
+    assert report_names(report_file) == ["a", "b"]
+
+
+def test_csv_changed_since_the_index_is_rebuilt(report_files):
+    output_dir, report_file = report_files
+    write_output(output_dir, "a")
+    report.main()
+    report_file.write_text("puzzle_name\n")  # Truncated by hand
+    write_output(output_dir, "b")
+    report.main()
+    assert report_names(report_file) == ["a", "b"]
@@ -0,0 +1,17 @@
+# tests/test_table_io.py
+from utils.table_io import load_table
+
+
+def test_table_is_built_once_then_mapped(tmp_path):
+    path = str(tmp_path / "tables" / "3x3_test.bin")
+    builds = []
+
+    def build():
+        builds.append(path)
+        return bytearray(range(10))
+
+    first = load_table(path, build, "test table")
+    second = load_table(path, build, "test table")
+    assert builds == [path]
+    assert first[:] == second[:] == bytes(range(10))
+    assert [name for name in (tmp_path / "tables").iterdir() if name.suffix == ".tmp"] == []
@@ -124,3 +124,48 @@ class ProgressPanel:
         self.x = x
         self.y = y
     
+    def draw_progress(self, screen, progress, algorithm):
+        """Draw the latest progress event of a running solve in a card layout"""
+        x, y = self.x, self.y
+        
+        # Draw progress card
+        progress_rect = pygame.Rect(x - 10, y - 10, 350, 250)
+        shadow_progress = progress_rect.copy()
+        shadow_progress.x += 2
+        shadow_progress.y += 2
+        pygame.draw.rect(screen, (0, 0, 0, 30), shadow_progress, border_radius=10)
+        pygame.draw.rect(screen, CARD_BACKGROUND, progress_rect, border_radius=10)
+        pygame.draw.rect(screen, BORDER, progress_rect, 2, border_radius=10)
+        
+        # Title
+        title_text = FONT_LARGE.render("Solving...", True, TEXT_PRIMARY)
+        screen.blit(title_text, (x, y))
+        y += 35
+        
+        if not progress:
+            text = FONT_MEDIUM.render("Starting search", True, TEXT_SECONDARY)
+            screen.blit(text, (x, y))
+            return
+        
+        # Progress data; solvers report only the fields they track
+        stats = [
+            ("Algorithm", algorithm),
+            ("Elapsed", f"{progress.get('elapsed', 0):.1f}s"),
+            ("Nodes Expanded", f"{progress.get('nodes_expanded', 0):,}"),
+            ("Nodes / Second", f"{progress.get('nodes_per_second', 0):,}")
+        ]
+        if "frontier_size" in progress:
+            stats.append(("Frontier Size", f"{progress['frontier_size']:,}"))
+        if "f_bound" in progress:
+            stats.append(("f-Bound", str(progress['f_bound'])))
+        if "depth" in progress:
+            stats.append(("Depth", str(progress['depth'])))
+        
+        for i, (label, value) in enumerate(stats):
+            # Label
+            label_text = FONT_SMALL.render(f"{label}:", True, TEXT_SECONDARY)
+            screen.blit(label_text, (x, y + i * 22))
+            
+            # Value
+            value_text = FONT_SMALL.render(str(value), True, TEXT_PRIMARY)
+            screen.blit(value_text, (x + 120, y + i * 22))
@@ -0,0 +1,164 @@
+"""
+Background Solver Process for the GUI
+"""
+import multiprocessing
+import queue
+import time
+
+# Seconds a cancelled solve may take to stop on its own before the process is killed
+KILL_GRACE = 2.0
+
+
+class _JobFlag:
+    """Cancel flag of one job: set once the GUI wants any other job (or none)"""
+
+    def __init__(self, wanted, job_id):
+        self.wanted = wanted
+        self.job_id = job_id
+
+    def is_set(self):
+        return self.wanted.value != self.job_id
+
+
+def _worker_main(requests, events, wanted):
+    """Solve requests until a None arrives, streaming progress and results back on events.
+
+    Every request ends with exactly one "result", "error" or "skipped" message.
+    The process lives as long as the GUI, so move tables, heuristic tables,
+    pattern databases and the solution cache stay warm between solves.
+    """
+    from main import run_solver  # Imported here so the GUI process starts without the solvers' setup
+
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        job_id, input_path, algorithm, heuristic = request
+        cancel = _JobFlag(wanted, job_id)
+        if cancel.is_set():
+            events.put(("skipped", job_id, None))  # Superseded while it waited in the queue
+            continue
+
+        def on_progress(event):
+            events.put(("progress", job_id, event))
+
+        try:
+            output = run_solver(input_path, algorithm, heuristic, verbose=False,
+                                budget={"cancel": cancel, "progress": on_progress})
+            events.put(("result", job_id, output))
+        except Exception as e:
+            events.put(("error", job_id, str(e)))
+
+
+class SolverWorker:
+    """Persistent solver process the GUI talks to through queues.
+
+    submit() starts a solve and cancels the previous one; poll() returns the
+    messages of the current solve without blocking, for the render loop to
+    apply. A cancelled solve that ignores its flag (e.g. stuck building a
+    table) is killed after KILL_GRACE seconds, and the process restarted with
+    the current request.
+    """
+
+    def __init__(self):
+        # Spawn, not fork: a forked child would inherit pygame's display state
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.requests = None
+        self.events = None
+        self.wanted = None
+        self.job_id = 0
+        self.request = None  # Arguments of the current job, to resubmit after a kill
+        self.cancelled = {}  # Job id -> time it was cancelled, until the process reports it done
+
+    def _start(self):
+        self.requests = self.context.Queue()
+        self.events = self.context.Queue()
+        self.wanted = self.context.Value('q', 0, lock=False)
+        self.process = self.context.Process(
+            target=_worker_main, args=(self.requests, self.events, self.wanted), daemon=True
+        )
+        self.process.start()
+        self.cancelled = {}
+
+    def submit(self, input_path, algorithm, heuristic):
+        """Start solving, cancelling any current solve; returns the job id"""
+        self.cancel()
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        self.job_id += 1
+        self.request = (self.job_id, input_path, algorithm, heuristic)
+        self.wanted.value = self.job_id
+        self.requests.put(self.request)
+        return self.job_id
+
+    def cancel(self):
+        """Stop the current solve; its messages are dropped from now on"""
+        if self.request is None:
+            return
+        self.cancelled[self.request[0]] = time.monotonic()
+        self.request = None
+        self.wanted.value = 0
+
+    def poll(self):
+        """Drain waiting messages; returns (kind, payload) pairs of the current job only.
+
+        kind is "progress", then one of "result" or "error"; an error is also
+        reported if the process dies under the current solve.
+        """
+        messages = []
+        if self.process is None:
+            return messages
+        while True:
+            try:
+                kind, job_id, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.request is not None and job_id == self.request[0]:
+                    messages.append((kind, payload))
+                continue
+            self.cancelled.pop(job_id, None)
+            if self.request is not None and job_id == self.request[0]:
+                messages.append((kind, payload))
+                self.request = None
+                self.wanted.value = 0
+        if not self.process.is_alive():
+            if self.request is not None:
+                messages.append(("error", f"Solver process exited with code {self.process.exitcode}"))
+            self.kill()
+            return messages
+        now = time.monotonic()
+        if any(now - cancelled_at > KILL_GRACE for cancelled_at in self.cancelled.values()):
+            self._restart()
+        return messages
+
+    def _restart(self):
+        """Kill a process stuck on a cancelled solve and resubmit the current one"""
+        request = self.request
+        self.kill()
+        if request is not None:
+            self._start()
+            self.request = request
+            self.wanted.value = request[0]
+            self.requests.put(request)
+
+    def kill(self):
+        """Terminate the process; the next submit starts a fresh one"""
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+        self.process = None
+        self.request = None
+        self.cancelled = {}
+
+    def close(self):
+        """Ask the process to finish, killing it if it does not within a second"""
+        if self.process is None:
+            return
+        self.cancel()
+        self.requests.put(None)
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.kill()
+        self.process = None
@@ -0,0 +1,153 @@
+# utils/budget.py
+
+"""Resource budgets for a single solve.
+
+Every solver takes budget=None. Loop-based solvers call exhausted() once per
+expansion and return result() when it fires; recursive solvers call charge(),
+which raises BudgetExceeded, and catch it at the top. The node count is exact;
+wall time and resident memory are sampled every CHECK_INTERVAL expansions so
+the common path stays a counter decrement.
+
+The same sampling point serves front ends: a budget can carry a cancel flag
+(anything with is_set(), e.g. threading.Event) and a progress callback. Solvers
+register a probe with watch() that reports their live frontier size and bound,
+and progress receives a dict of those fields plus nodes_expanded, elapsed and
+nodes_per_second at most every PROGRESS_INTERVAL seconds, on the solving thread.
+"""
+
+import os
+import sys
+import time
+
+BUDGET_EXCEEDED = "Budget exceeded"
+CANCELLED = "Cancelled"
+CHECK_INTERVAL = 1024
+PROGRESS_INTERVAL = 0.1  # Seconds between progress events
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def resident_bytes():
+    """Current resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    return peak_resident_bytes()  # Peak rather than current size, the best left to read
+
+
+def peak_resident_bytes():
+    """Largest resident set size this process has had, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class BudgetExceeded(Exception):
+    """Raised by Budget.charge once a limit is reached; reason is 'time', 'nodes', 'memory' or 'cancelled'."""
+
+    def __init__(self, reason, nodes_expanded):
+        super().__init__(reason)
+        self.reason = reason
+        self.nodes_expanded = nodes_expanded
+
+
+class Budget:
+    """Limits on wall time (seconds), nodes expanded and resident memory (MiB) for one solve,
+    plus an optional cancel flag and progress callback.
+
+    The clock starts when the budget is created, so build one per solve.
+    """
+
+    def __init__(self, max_time=None, max_nodes=None, max_memory=None, cancel=None, progress=None):
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + max_time if max_time else None
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory * 1024 * 1024 if max_memory else None
+        self.cancel = cancel
+        self.progress = progress
+        self.probe = None
+        self.countdown = CHECK_INTERVAL
+        self.reason = None
+        self.peak_memory = 0
+        self.nodes_expanded = 0
+        self.last_event = (self.start_time, 0)
+
+    def watch(self, probe):
+        """Register a no-argument callable returning the solver's live fields for progress events,
+        e.g. lambda: {"frontier_size": len(frontier), "f_bound": f}."""
+        self.probe = probe
+
+    def exhausted(self, nodes_expanded):
+        """True once a limit is reached; call before each expansion."""
+        if self.max_nodes is not None and nodes_expanded >= self.max_nodes:
+            self.reason = "nodes"
+            return True
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = CHECK_INTERVAL
+        self.nodes_expanded = nodes_expanded
+        return self._sample()
+
+    def _sample(self):
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+            return True
+        now = time.perf_counter()
+        if self.deadline is not None and now > self.deadline:
+            self.reason = "time"
+            return True
+        if self.progress is not None and now - self.last_event[0] >= PROGRESS_INTERVAL:
+            self._emit(now)
+        if self.max_memory is not None:
+            resident = resident_bytes()
+            if resident is not None:
+                self.peak_memory = max(self.peak_memory, resident)
+                if resident > self.max_memory:
+                    self.reason = "memory"
+                    return True
+        return False
+
+    def _emit(self, now):
+        """Send one progress event; the rate covers the nodes since the previous event."""
+        last_time, last_nodes = self.last_event
+        event = {
+            "nodes_expanded": self.nodes_expanded,
+            "elapsed": round(now - self.start_time, 3),
+            "nodes_per_second": round((self.nodes_expanded - last_nodes) / (now - last_time))
+        }
+        if self.probe is not None:
+            event.update(self.probe())
+        self.last_event = (now, self.nodes_expanded)
+        self.progress(event)
+
+    def charge(self, nodes_expanded):
+        """exhausted() for recursive solvers: raise BudgetExceeded instead of returning True."""
+        if self.exhausted(nodes_expanded):
+            raise BudgetExceeded(self.reason, nodes_expanded)
+
+    def result(self, start_time, nodes_expanded, space_used, **partial):
+        """Result dict of a solve cut off by this budget, with whatever partial
+        information the solver had (e.g. lower_bound, depth_reached, frontier_size)."""
+        result = {
+            "status": CANCELLED if self.reason == "cancelled" else BUDGET_EXCEEDED,
+            "solution_path": [],
+            "solution_length": 0,
+            "time_taken": round(time.perf_counter() - start_time, 6),
+            "space_used": space_used,
+            "nodes_expanded": nodes_expanded,
+            "budget": self.reason
+        }
+        if self.peak_memory:
+            result["peak_memory"] = self.peak_memory
+        result.update(partial)
+        return result
@@ -0,0 +1,192 @@
+# utils/closed_set.py
+
+"""Closed (visited) sets over packed states.
+
+Every backend offers add(state), insert(state) -> newly added, discard(state)
+for searches that reopen states, `state in closed`, len(closed) and nbytes(), so
+solvers can report the real memory held by their visited states.
+
+- StateSet: Python's built-in set. The fastest backend, used by default
+  while the whole state space fits comfortably in it (3x3 and smaller) and
+  for boards wider than 64 bits.
+- PackedHashSet: open addressing over a typed array of 64-bit packed states,
+  about a quarter of a set's memory per state. Used by default for bigger
+  boards whose packed state fits in 64 bits (4x4), where memory runs out first.
+- PermutationBitmap: one bit per board permutation, addressed by its
+  Lehmer-code rank. The most compact, but ranking every state costs more than
+  a set lookup, so it is only used when asked for, and only up to
+  BITMAP_LIMIT permutations (3x3 boards; 4x4 would take 2.6 TB).
+"""
+
+import sys
+from array import array
+
+from utils.errors import UnsupportedError
+from utils.rank import permutation_count, state_rank
+from utils.state import tile_bits
+
+SET_LIMIT = 1 << 20  # Largest state space 'auto' keeps in a built-in set
+BITMAP_LIMIT = 1 << 32  # Largest state space a bitmap is allocated for: 512 MiB of bits
+
+
+class PermutationBitmap:
+    """Perfect-hash bitmap over all permutations of a size x size board."""
+
+    def __init__(self, size):
+        if permutation_count(size) > BITMAP_LIMIT:
+            raise UnsupportedError(f"a permutation bitmap for {size}x{size} boards would take "
+                             f"{permutation_count(size) // 8:,} bytes")
+        self.size = size
+        self.bits = bytearray((permutation_count(size) + 7) // 8)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, state):
+        rank = state_rank(state, self.size)
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+    def add(self, state):
+        self.insert(state)
+
+    def insert(self, state):
+        """Add state; return False if it was already present. Ranks the state once."""
+        rank = state_rank(state, self.size)
+        byte, bit = rank >> 3, 1 << (rank & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def discard(self, state):
+        rank = state_rank(state, self.size)
+        byte, bit = rank >> 3, 1 << (rank & 7)
+        if self.bits[byte] & bit:
+            self.bits[byte] &= ~bit & 0xFF
+            self.count -= 1
+
+    def nbytes(self):
+        return len(self.bits)
+
+
+class PackedHashSet:
+    """Open-addressing hash set of packed states stored in an array('Q').
+
+    0 is never a valid packed board (tiles 1..n-1 are non-zero), so it marks
+    empty slots. Probing is linear; the table doubles past half load.
+    """
+
+    EMPTY = 0
+    MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing spreads nearby packed states
+    MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity=1 << 12):
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.slots = array('Q', bytes(8 * capacity))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _slot(self, state):
+        """Index of state's slot, or of the empty slot where it would go."""
+        mask = self.capacity - 1
+        index = ((state * self.MULTIPLIER) & self.MASK64) >> self.shift
+        slots = self.slots
+        while True:
+            current = slots[index]
+            if current == state or current == self.EMPTY:
+                return index
+            index = (index + 1) & mask
+
+    def __contains__(self, state):
+        return self.slots[self._slot(state)] == state
+
+    def add(self, state):
+        self.insert(state)
+
+    def insert(self, state):
+        """Add state; return False if it was already present. Probes once."""
+        index = self._slot(state)
+        if self.slots[index] == state:
+            return False
+        self.slots[index] = state
+        self.count += 1
+        if 2 * self.count > self.capacity:
+            self._grow()
+        return True
+
+    def discard(self, state):
+        """Remove state if present, shifting back the entries probed past its slot so lookups still find them."""
+        index = self._slot(state)
+        slots = self.slots
+        if slots[index] != state:
+            return
+        self.count -= 1
+        mask = self.capacity - 1
+        hole = index
+        index = (index + 1) & mask
+        while slots[index] != self.EMPTY:
+            home = ((slots[index] * self.MULTIPLIER) & self.MASK64) >> self.shift
+            # The entry may fill the hole only if the hole lies on its probe path, from home to here
+            if (index - home) & mask >= (index - hole) & mask:
+                slots[hole] = slots[index]
+                hole = index
+            index = (index + 1) & mask
+        slots[hole] = self.EMPTY
+
+    def _grow(self):
+        old = self.slots
+        self.__init__(self.capacity * 2)
+        for state in old:
+            if state != self.EMPTY:
+                self.slots[self._slot(state)] = state
+                self.count += 1
+
+    def nbytes(self):
+        return self.slots.itemsize * len(self.slots)
+
+
+class StateSet(set):
+    """Built-in set with the closed-set insert() and nbytes() interface."""
+
+    def insert(self, state):
+        """Add state; return False if it was already present."""
+        if state in self:
+            return False
+        self.add(state)
+        return True
+
+    def nbytes(self):
+        # Table plus the int objects it references
+        return sys.getsizeof(self) + sum(sys.getsizeof(state) for state in self)
+
+
+class CostMap(dict):
+    """Built-in dict of state -> best g so far, for searches that reopen states, with nbytes()."""
+
+    def nbytes(self):
+        # Table plus the state and cost int objects it references
+        return sys.getsizeof(self) + sum(sys.getsizeof(state) + sys.getsizeof(g) for state, g in self.items())
+
+
+CLOSED_SETS = {
+    "bitmap": PermutationBitmap,
+    "hash": lambda size: PackedHashSet(),
+    "set": lambda size: StateSet(),
+}
+
+
+def make_closed_set(size, backend="auto"):
+    """Build a closed set for this board size. 'auto' picks the fastest backend memory allows."""
+    if backend == "auto":
+        if permutation_count(size) <= SET_LIMIT:
+            backend = "set"
+        elif tile_bits(size) * size * size <= 64:
+            backend = "hash"
+        else:
+            backend = "set"
+    return CLOSED_SETS[backend](size)
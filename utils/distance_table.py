@@ -0,0 +1,82 @@
+# utils/distance_table.py
+
+"""Exhaustive distance tables for small boards.
+
+One BFS backwards from the goal visits every reachable board and records its
+distance, one byte per permutation rank (see utils/rank.py). A lookup is then
+the exact number of moves to the goal, so the table doubles as a perfect
+heuristic and, by greedy descent, as an O(depth) solver. Tables are cached
+under data/distance as raw bytes and memory-mapped on load, like the pattern
+databases (see utils/table_io.py).
+"""
+
+import os
+
+from utils.errors import UnsupportedError
+from utils.move import get_move_table
+from utils.rank import permutation_count, state_rank
+from utils.state import blank_index
+from utils.table_io import goal_digest, load_table
+
+DISTANCE_DIR = os.path.join("data", "distance")
+MAX_SIZE = 3  # 4x4 would need 16! bytes
+UNREACHED = 255
+
+
+def build_distance_table(goal_state, size):
+    """BFS from the goal over every board; return a bytearray indexed by state rank."""
+    moves = get_move_table(size)
+    table = bytearray([UNREACHED]) * permutation_count(size)
+    table[state_rank(goal_state, size)] = 0
+    layer = [(goal_state, blank_index(goal_state, size), None)]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for state, blank, last_action in layer:
+            for action, child, child_blank in moves.neighbors(state, blank, last_action):
+                rank = state_rank(child, size)
+                if table[rank] == UNREACHED:
+                    table[rank] = depth
+                    next_layer.append((child, child_blank, action))
+        layer = next_layer
+    return table
+
+
+def table_path(goal_state, size):
+    """Cache file for one goal; the name pins the board size and the goal."""
+    return os.path.join(DISTANCE_DIR, f"{size}x{size}_{goal_digest(goal_state, size)}.bin")
+
+
+def load_distance_table(goal_state, size):
+    """Memory-map the cached table, building and saving it first if missing."""
+    if size > MAX_SIZE:
+        raise UnsupportedError(f"exhaustive distance tables are only supported up to {MAX_SIZE}x{MAX_SIZE}")
+    return load_table(table_path(goal_state, size), lambda: build_distance_table(goal_state, size),
+                      "distance table")
+
+
+_loaded = {}
+
+
+class DistanceTable:
+    """Exact distance to the goal by table lookup: a perfect heuristic for small boards."""
+
+    consistent = True
+
+    def __init__(self, goal_state, size):
+        self.size = size
+        key = (size, goal_state)
+        if key not in _loaded:
+            _loaded[key] = load_distance_table(goal_state, size)
+        self.table = _loaded[key]
+
+    def estimate(self, state):
+        """Moves to the goal, or UNREACHED for the other parity class. O(n)."""
+        return self.table[state_rank(state, self.size)]
+
+    def update(self, h, state, tile, src, dst):
+        return self.table[state_rank(state, self.size)]
+
+    def nbytes(self):
+        return len(self.table)
@@ -0,0 +1,11 @@
+# utils/errors.py
+
+"""Exceptions shared by solvers, heuristics and their tables."""
+
+
+class UnsupportedError(ValueError):
+    """The solver, heuristic or backend cannot handle this board, e.g. oracle on 4x4.
+
+    main records it as status Unsupported. Any other exception out of a solver
+    is a bug and propagates.
+    """
@@ -0,0 +1,166 @@
+# utils/heuristics.py
+
+from functools import lru_cache
+
+from utils.state import tile_bits, tile_positions
+from utils.pdb import PatternDatabase
+from utils.distance_table import DistanceTable
+from utils.walking_distance import WalkingDistance
+
+
+class ManhattanDistance:
+    """Manhattan distance to a fixed goal, with O(1) re-scoring after a move.
+
+    The goal-position lookup table is built once per solve: dist[tile * n + pos]
+    holds the Manhattan distance of tile standing at pos from its goal cell.
+    """
+
+    consistent = True  # One move changes h by at most 1
+
+    def __init__(self, goal_state, size):
+        self.size = size
+        n = size * size
+        goal_positions = tile_positions(goal_state, size)
+        self.dist = [0] * (n * n)
+        for tile in range(1, n):
+            goal_x, goal_y = divmod(goal_positions[tile], size)
+            for pos in range(n):
+                x, y = divmod(pos, size)
+                self.dist[tile * n + pos] = abs(x - goal_x) + abs(y - goal_y)
+
+    def estimate(self, state):
+        """Score a state from scratch. O(n)."""
+        n = self.size * self.size
+        positions = tile_positions(state, self.size)
+        return sum(self.dist[tile * n + positions[tile]] for tile in range(1, n))
+
+    def update(self, h, state, tile, src, dst):
+        """Re-score the child state after tile slid from src to dst. O(1)."""
+        n = self.size * self.size
+        return h + self.dist[tile * n + dst] - self.dist[tile * n + src]
+
+
+class LinearConflict(ManhattanDistance):
+    """Manhattan distance plus 2 moves for every tile that must leave its line to let another pass.
+
+    A move only changes conflicts in the two lines the tile crossed between
+    (columns for a horizontal move, rows for a vertical one), so update
+    recounts just those.
+    """
+
+    def __init__(self, goal_state, size):
+        super().__init__(goal_state, size)
+        self.bits = tile_bits(size)
+        self.mask = (1 << self.bits) - 1
+        goal_positions = tile_positions(goal_state, size)
+        self.goal_row = [pos // size for pos in goal_positions]
+        self.goal_col = [pos % size for pos in goal_positions]
+        self.rows = [[r * size + c for c in range(size)] for r in range(size)]
+        self.cols = [[r * size + c for r in range(size)] for c in range(size)]
+
+    def _line_conflicts(self, state, cells, line, goal_line, goal_order):
+        """2 x (tiles in their goal line - longest run already in goal order)."""
+        bits, mask = self.bits, self.mask
+        order = []
+        for pos in cells:
+            tile = (state >> (pos * bits)) & mask
+            if tile and goal_line[tile] == line:
+                order.append(goal_order[tile])
+        if len(order) < 2:
+            return 0
+        longest = [1] * len(order)
+        for i in range(1, len(order)):
+            for j in range(i):
+                if order[j] < order[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        return 2 * (len(order) - max(longest))
+
+    def estimate(self, state):
+        h = super().estimate(state)
+        for r, cells in enumerate(self.rows):
+            h += self._line_conflicts(state, cells, r, self.goal_row, self.goal_col)
+        for c, cells in enumerate(self.cols):
+            h += self._line_conflicts(state, cells, c, self.goal_col, self.goal_row)
+        return h
+
+    def update(self, h, state, tile, src, dst):
+        h = super().update(h, state, tile, src, dst)
+        size = self.size
+        parent = state + tile * ((1 << (src * self.bits)) - (1 << (dst * self.bits)))
+        if src // size == dst // size:
+            lines, goal_line, goal_order = (src % size, dst % size), self.goal_col, self.goal_row
+            all_cells = self.cols
+        else:
+            lines, goal_line, goal_order = (src // size, dst // size), self.goal_row, self.goal_col
+            all_cells = self.rows
+        for line in lines:
+            cells = all_cells[line]
+            h += (self._line_conflicts(state, cells, line, goal_line, goal_order)
+                  - self._line_conflicts(parent, cells, line, goal_line, goal_order))
+        return h
+
+
+class ZeroHeuristic:
+    """h = 0 everywhere; turns informed solvers into their blind counterparts."""
+
+    consistent = True
+
+    def __init__(self, goal_state, size):
+        self.size = size
+
+    def estimate(self, state):
+        return 0
+
+    def update(self, h, state, tile, src, dst):
+        return 0
+
+
+# Registry of heuristic name -> factory(goal_state, size). Every factory returns an
+# object with estimate(state), update(h, state, tile, src, dst) and a consistent flag
+# (see is_consistent); None is blind search.
+HEURISTICS = {
+    "manhattan": ManhattanDistance,
+    "linear_conflict": LinearConflict,
+    "walking_distance": WalkingDistance,
+    "pdb": PatternDatabase,
+    "oracle": DistanceTable,
+    None: ZeroHeuristic,
+}
+
+
+def is_consistent(estimator):
+    """True if one move never lowers h by more than 1, so the first path a best-first search
+    expands to a state is a cheapest one. Heuristics that do not say are taken to be
+    inconsistent: solvers then reopen states, which costs time but never optimality.
+    """
+    return getattr(estimator, "consistent", False)
+
+
+def register_heuristic(name, factory):
+    """Add a heuristic to the registry so solvers, the CLI and the GUI can select it."""
+    HEURISTICS[name] = factory
+    _build_heuristic.cache_clear()
+
+
+def heuristic_names():
+    """Registry names as shown on the command line, with 'none' for blind search."""
+    return [name if name is not None else "none" for name in HEURISTICS]
+
+
+@lru_cache(maxsize=32)
+def _build_heuristic(name, goal_state, size):
+    return HEURISTICS[name](goal_state, size)
+
+
+def make_heuristic(name, goal_state, size):
+    """Return the named heuristic for this goal. Raise KeyError for unknown names.
+
+    Heuristics are read-only once built, apart from memos that only depend on the
+    state, so instances (and their lookup tables) are shared by every solve
+    against the same goal.
+    """
+    if isinstance(name, str):
+        name = name.lower()
+        if name == "none":
+            name = None
+    return _build_heuristic(name, goal_state, size)
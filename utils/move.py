@@ -1,23 +1,68 @@
 # utils/move.py
 
-def get_neighbors(state, size):
-    """Return list of (action, new_state) pairs reachable from the current state."""
-    neighbors = []
-    zero_index = state.index(0)
-    row, col = divmod(zero_index, size)
-
-    def swap(index1, index2):
-        new_state = state.copy()
-        new_state[index1], new_state[index2] = new_state[index2], new_state[index1]
-        return new_state
-
-    if col > 0:  # Move left
-        neighbors.append(("L", swap(zero_index, zero_index - 1)))
-    if col < size - 1:  # Move right
-        neighbors.append(("R", swap(zero_index, zero_index + 1)))
-    if row > 0:  # Move up
-        neighbors.append(("U", swap(zero_index, zero_index - size)))
-    if row < size - 1:  # Move down
-        neighbors.append(("D", swap(zero_index, zero_index + size)))
-
-    return neighbors
+from functools import lru_cache
+from utils.state import tile_bits
+
+REVERSE_ACTION = {"L": "R", "R": "L", "U": "D", "D": "U"}
+
+
+class MoveTable:
+    """Legal moves of every blank position on a size x size board, built once per size."""
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = tile_bits(size)
+        self.mask = (1 << self.bits) - 1
+        self.moves = []    # blank -> ((action, target, shift, delta), ...)
+        self.pruned = []   # blank -> {last_action: moves without the one undoing it}
+
+        for blank in range(size * size):
+            row, col = divmod(blank, size)
+            targets = []
+            if col > 0:  # Move left
+                targets.append(("L", blank - 1))
+            if col < size - 1:  # Move right
+                targets.append(("R", blank + 1))
+            if row > 0:  # Move up
+                targets.append(("U", blank - size))
+            if row < size - 1:  # Move down
+                targets.append(("D", blank + size))
+
+            # Sliding tile t from target into blank adds t * delta to the packed state
+            moves = tuple(
+                (action, target, target * self.bits, (1 << (blank * self.bits)) - (1 << (target * self.bits)))
+                for action, target in targets
+            )
+            self.moves.append(moves)
+            self.pruned.append({
+                last: tuple(move for move in moves if move[0] != REVERSE_ACTION[last])
+                for last in REVERSE_ACTION
+            })
+
+    def apply(self, state, blank, target):
+        """Slide the tile at target into the blank. O(1) on the packed state."""
+        shift = target * self.bits
+        tile = (state >> shift) & self.mask
+        return state + tile * ((1 << (blank * self.bits)) - (1 << shift))
+
+    def moves_from(self, blank, last_action=None):
+        """Return the raw (action, target, shift, delta) moves, skipping the one that undoes last_action."""
+        return self.moves[blank] if last_action is None else self.pruned[blank][last_action]
+
+    def neighbors(self, state, blank, last_action=None):
+        """Return (action, new_state, new_blank) triples, skipping the move that undoes last_action."""
+        moves = self.moves_from(blank, last_action)
+        mask = self.mask
+        return [(action, state + ((state >> shift) & mask) * delta, target)
+                for action, target, shift, delta in moves]
+
+
+@lru_cache(maxsize=None)
+def get_move_table(size):
+    """Return the shared MoveTable for this board size."""
+    return MoveTable(size)
+
+
+def get_neighbors(state, blank, size, last_action=None):
+    """Return list of (action, new_state, new_blank) triples reachable from the packed state."""
+    return get_move_table(size).neighbors(state, blank, last_action)
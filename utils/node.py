@@ -1,22 +1,69 @@
 # utils/node.py
 
-class Node:
-    def __init__(self, state, parent=None, action=None, depth=0, cost=0):
-        self.state = state          # List[int] - flattened puzzle state
-        self.parent = parent        # Node or None
-        self.action = action        # "L", "R", "U", "D" or None
-        self.depth = depth          # For BFS/DFS
-        self.cost = cost            # g(n) for A*
-
-    def extract_path(self):
-        """Backtrack from goal to start to get the move sequence."""
+from array import array
+
+from utils.move import REVERSE_ACTION
+from utils.state import tile_bits
+
+ACTIONS = ("L", "R", "U", "D")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+NO_PARENT = -1
+
+
+class NodeArena:
+    """Struct-of-arrays node storage. Solvers refer to nodes by their integer index.
+
+    Each node costs about 20 bytes spread over parallel typed arrays, instead of an
+    object per node plus its own state. Boards whose packed state does not fit in 64
+    bits fall back to a plain list for the state column.
+    """
+
+    def __init__(self, size):
+        self.state = array('Q') if tile_bits(size) * size * size <= 64 else []
+        self.parent = array('i')    # Index of the parent node, NO_PARENT for the root
+        self.move = array('b')      # ACTION_CODES of the move from the parent, -1 for the root
+        self.blank = array('B')     # Cached index of the blank tile
+        self.g = array('I')         # Path cost / depth
+        self.h = array('H')         # Heuristic value, for informed solvers
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, state, blank, parent=NO_PARENT, action=None, g=0, h=0):
+        """Append a node and return its index."""
+        self.state.append(state)
+        self.parent.append(parent)
+        self.move.append(-1 if action is None else ACTION_CODES[action])
+        self.blank.append(blank)
+        self.g.append(g)
+        self.h.append(h)
+        return len(self.parent) - 1
+
+    def action(self, index):
+        """Move that led to the node, or None for a root."""
+        code = self.move[index]
+        return None if code < 0 else ACTIONS[code]
+
+    def extract_path(self, index):
+        """Walk the parent indexes back to the root to get the move sequence."""
         path = []
-        node = self
-        while node.parent is not None:
-            path.append(node.action)
-            node = node.parent
+        while self.parent[index] != NO_PARENT:
+            path.append(ACTIONS[self.move[index]])
+            index = self.parent[index]
         return list(reversed(path))
 
-    def __lt__(self, other):
-        # Required for priority queue comparisons
-        return (self.cost or 0) < (other.cost or 0)
+    def extract_reverse_path(self, index):
+        """Moves leading from the node back to its root, e.g. from a meeting node to the goal."""
+        path = []
+        while self.parent[index] != NO_PARENT:
+            path.append(REVERSE_ACTION[ACTIONS[self.move[index]]])
+            index = self.parent[index]
+        return path
+
+    def nbytes(self):
+        """Bytes held by the node columns."""
+        columns = (self.parent, self.move, self.blank, self.g, self.h)
+        total = sum(column.itemsize * len(column) for column in columns)
+        if isinstance(self.state, array):
+            return total + self.state.itemsize * len(self.state)
+        return total + sum(state.__sizeof__() for state in self.state)
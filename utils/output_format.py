@@ -0,0 +1,54 @@
+# utils/output_format.py
+
+"""Result record layouts.
+
+The default layout is the indented JSON written since the first release. The
+compact layout packs solution_path into one string of move letters ("RRDLU")
+and writes the record on a single line; benchmark runs can also drop the path
+altogether and keep only solution_length. Readers go through expand_output,
+which accepts every layout.
+"""
+
+import json
+
+
+def pack_path(path):
+    """Moves as one string, e.g. ["R", "R", "D"] -> "RRD"."""
+    return "".join(path)
+
+
+def unpack_path(path):
+    """Inverse of pack_path; lists pass through unchanged."""
+    return list(path) if isinstance(path, str) else path
+
+
+def format_output(output, compact=False, include_path=True):
+    """Record to write for output, in the requested layout."""
+    record = dict(output)
+    if not include_path:
+        record.pop("solution_path", None)
+    elif compact and "solution_path" in record:
+        record["solution_path"] = pack_path(record["solution_path"])
+    return record
+
+
+def expand_output(record):
+    """Output dict with solution_path as a list of moves, whatever layout the record was written in."""
+    output = dict(record)
+    if "solution_path" in output:
+        output["solution_path"] = unpack_path(output["solution_path"])
+    return output
+
+
+def dump_output(output, f, compact=False, include_path=True):
+    record = format_output(output, compact, include_path)
+    if compact:
+        json.dump(record, f, separators=(",", ":"))
+    else:
+        json.dump(record, f, indent=4)
+
+
+def output_line(output, compact=False, include_path=True):
+    """One-line JSON of the record, for JSONL result streams."""
+    record = format_output(output, compact, include_path)
+    return json.dumps(record, separators=(",", ":")) if compact else json.dumps(record)
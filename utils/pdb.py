@@ -0,0 +1,228 @@
+# utils/pdb.py
+
+"""Additive disjoint pattern databases.
+
+Tiles are split into disjoint groups. For each group a retrograde BFS from the
+goal counts only the moves of that group's tiles (the other tiles are
+indistinguishable and slide for free), so the per-group values can be summed
+into an admissible heuristic. Tables hold one byte per placement of the group's
+tiles, indexed by a k-permutation rank, and are cached under data/pdb as raw
+bytes that are memory-mapped on load (see utils/table_io.py).
+"""
+
+import os
+
+from utils.errors import UnsupportedError
+from utils.state import tile_bits, tile_positions
+from utils.table_io import goal_digest, load_table
+
+PDB_DIR = os.path.join("data", "pdb")
+UNSEEN = 255
+MEMO_LIMIT = 1 << 14  # States whose placements are remembered; holds every ancestor of a search branch
+
+
+def default_partition(size):
+    """Return the default tile groups: one full table up to 3x3, 5-5-5 for 4x4."""
+    n = size * size
+    if n <= 9:
+        return (tuple(range(1, n)),)
+    if size == 4:
+        return ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15))
+    raise UnsupportedError(f"no default pattern partition for {size}x{size} boards")
+
+
+def table_entries(n, k):
+    """Number of ways to place k distinct tiles on n cells."""
+    entries = 1
+    for i in range(k):
+        entries *= n - i
+    return entries
+
+
+def rank_multipliers(n, k):
+    """Mixed-radix weights used by rank_placement."""
+    multipliers = []
+    for i in range(k):
+        multipliers.append(table_entries(n - 1 - i, k - 1 - i))
+    return multipliers
+
+
+def rank_placement(positions, multipliers):
+    """Rank distinct cell indices as a k-permutation of the board cells. O(k)."""
+    rank = 0
+    used = 0
+    for pos, weight in zip(positions, multipliers):
+        rank += (pos - (used & ((1 << pos) - 1)).bit_count()) * weight
+        used |= 1 << pos
+    return rank
+
+
+def _adjacent_cells(size):
+    cells = []
+    for pos in range(size * size):
+        row, col = divmod(pos, size)
+        adjacent = []
+        if col > 0:
+            adjacent.append(pos - 1)
+        if col < size - 1:
+            adjacent.append(pos + 1)
+        if row > 0:
+            adjacent.append(pos - size)
+        if row < size - 1:
+            adjacent.append(pos + size)
+        cells.append(adjacent)
+    return cells
+
+
+def build_pattern_table(pattern, goal_state, size):
+    """Retrograde 0-1 BFS over placements of the pattern tiles plus the blank.
+
+    Moving a pattern tile costs 1, moving any other tile costs 0. All blank
+    cells reachable for free form one region, so each layer flood-fills a
+    region and then pushes every pattern tile bordering it into the next layer.
+    """
+    n = size * size
+    k = len(pattern)
+    bits = (n - 1).bit_length()
+    cell_mask = (1 << bits) - 1
+    multipliers = rank_multipliers(n, k)
+    adjacent = _adjacent_cells(size)
+    goal_positions = tile_positions(goal_state, size)
+
+    table = bytearray([UNSEEN]) * table_entries(n, k)
+    seen = bytearray(len(table) * n)  # (rank, blank) pairs already placed in a region
+
+    # A layer entry packs the pattern positions and the blank into one int
+    start = 0
+    for i, tile in enumerate(pattern):
+        start |= goal_positions[tile] << (bits * i)
+    layer = [(start << bits) | goal_positions[0]]
+    depth = 0
+
+    while layer:
+        next_layer = []
+        for entry in layer:
+            blank = entry & cell_mask
+            code = entry >> bits
+            positions = [(code >> (bits * i)) & cell_mask for i in range(k)]
+            rank = rank_placement(positions, multipliers)
+            base = rank * n
+            if seen[base + blank]:
+                continue
+
+            occupied = {pos: i for i, pos in enumerate(positions)}
+            seen[base + blank] = 1
+            region = [blank]
+            for cell in region:
+                for nb in adjacent[cell]:
+                    if nb not in occupied and not seen[base + nb]:
+                        seen[base + nb] = 1
+                        region.append(nb)
+
+            if table[rank] == UNSEEN:
+                table[rank] = depth
+
+            for cell in region:
+                for nb in adjacent[cell]:
+                    i = occupied.get(nb)
+                    if i is None:
+                        continue
+                    # Tile i slides from nb into the region; nb becomes the blank
+                    positions[i] = cell
+                    if not seen[rank_placement(positions, multipliers) * n + nb]:
+                        next_code = code + ((cell - nb) << (bits * i))
+                        next_layer.append((next_code << bits) | nb)
+                    positions[i] = nb
+
+        layer = next_layer
+        depth += 1
+
+    return table
+
+
+def table_path(pattern, goal_state, size):
+    """Cache file for one pattern; the name pins the board size, the tiles and the goal."""
+    tiles = "-".join(str(tile) for tile in pattern)
+    return os.path.join(PDB_DIR, f"{size}x{size}_{tiles}_{goal_digest(goal_state, size)}.bin")
+
+
+def load_pattern_table(pattern, goal_state, size):
+    """Memory-map the cached table, building and saving it first if missing."""
+    return load_table(table_path(pattern, goal_state, size), lambda: build_pattern_table(pattern, goal_state, size),
+                      "pattern database")
+
+
+_loaded = {}
+
+
+class PatternDatabase:
+    """Sum of disjoint pattern database lookups. Tables load lazily on first use per goal.
+
+    Each table stores the least cost over every blank position that fits the
+    placement, so the sum is admissible but not consistent: one move can raise
+    it by several (on 4x4, move U from 1,2,3,6,0,10,7,4,5,11,8,12,14,9,13,15
+    takes it from 19 to 24). consistent is False unless a single pattern
+    holds every tile, which pins the blank and makes the table exact. Solvers
+    that close states check it and reopen states when it is False.
+    """
+
+    def __init__(self, goal_state, size, partition=None):
+        self.size = size
+        self.partition = tuple(partition or default_partition(size))
+        self.consistent = len(self.partition) == 1 and len(self.partition[0]) == size * size - 1
+        key = (size, goal_state, self.partition)
+        if key not in _loaded:
+            _loaded[key] = [load_pattern_table(pattern, goal_state, size) for pattern in self.partition]
+        self.tables = _loaded[key]
+
+        n = size * size
+        self.bits = tile_bits(size)
+        self.multipliers = [rank_multipliers(n, len(pattern)) for pattern in self.partition]
+        self.group_of = [None] * n
+        self.slot_of = [None] * n  # Index of each tile within its group's placement
+        for g, pattern in enumerate(self.partition):
+            for slot, tile in enumerate(pattern):
+                self.group_of[tile] = g
+                self.slot_of[tile] = slot
+        self.placements = {}  # state -> cells of each group's tiles, for the states scored most recently
+
+    def _placements(self, state):
+        """Cells of each group's tiles: remembered if state was scored recently, else read off the board. O(n)."""
+        placements = self.placements.get(state)
+        if placements is None:
+            positions = tile_positions(state, self.size)
+            placements = tuple(tuple(positions[tile] for tile in pattern) for pattern in self.partition)
+            self._remember(state, placements)
+        return placements
+
+    def _remember(self, state, placements):
+        if len(self.placements) >= MEMO_LIMIT:
+            self.placements.clear()
+        self.placements[state] = placements
+
+    def estimate(self, state):
+        """Sum the lookups of every group. O(n)."""
+        return sum(
+            table[rank_placement(placement, multipliers)]
+            for placement, table, multipliers in zip(self._placements(state), self.tables, self.multipliers)
+        )
+
+    def update(self, h, state, tile, src, dst):
+        """Re-score after tile slid from src to dst. O(k) once the parent's placements are known.
+
+        Searches score a state's children right after scoring the state, so its
+        placements are remembered; only the moved tile's cell changes, and only
+        its group is looked up again.
+        """
+        parent = state + tile * ((1 << (src * self.bits)) - (1 << (dst * self.bits)))
+        placements = self._placements(parent)
+        g = self.group_of[tile]
+        if g is None:
+            self._remember(state, placements)
+            return h
+        table, multipliers = self.tables[g], self.multipliers[g]
+        placement = list(placements[g])
+        old_value = table[rank_placement(placement, multipliers)]
+        placement[self.slot_of[tile]] = dst
+        self._remember(state, placements[:g] + (tuple(placement),) + placements[g + 1:])
+        return h - old_value + table[rank_placement(placement, multipliers)]
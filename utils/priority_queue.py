@@ -21,32 +21,109 @@ class PriorityQueue:
         return len(self.entries)
     
     
-    def add(self, item, priority):
-        "Add new item or update the priority of the current item."
-        if tuple(item.state) in self.entries:
-            self.remove(item)
-        entry = [priority, self.counter, item]
-        self.entries[tuple(item.state)] = entry
+    def add(self, key, item, priority, g=0):
+        "Add new item under a state key or update the priority of the current one. g is accepted for parity with BucketQueue; ties stay FIFO."
+        if key in self.entries:
+            self.remove(key)
+        entry = [priority, self.counter, key, item]
+        self.entries[key] = entry
         heapq.heappush(self.pq, entry)
         self.counter += 1
         
 
-    def remove(self, item):
+    def remove(self, key):
         "Mark an existing task as REMOVED.  Raise KeyError if not found."
-        outdated_entry = self.entries.pop(tuple(item.state))
+        outdated_entry = self.entries.pop(key)
         outdated_entry[-1] = self.REMOVED
 
 
     def pop(self):
         "Remove and return the lowest priority item. Raise KeyError if empty."
         while self.entries:
-            priority, _, item = heapq.heappop(self.pq)
+            priority, _, key, item = heapq.heappop(self.pq)
             if item is not self.REMOVED:
-                del self.entries[tuple(item.state)]
+                del self.entries[key]
                 return item, priority
         raise KeyError("pop from an empty priority queue")
 
     
     def get_priority(self, entry_key):
         "Return priority of existing item. Raise KeyError if not found."
-        return self.entries[entry_key][0]
\ No newline at end of file
+        return self.entries[entry_key][0]
+
+
+    def get_item(self, entry_key):
+        "Return the item stored under a state key. Raise KeyError if not found."
+        return self.entries[entry_key][-1]
+
+
+class BucketQueue:
+    "Open list for small integer priorities: buckets indexed by priority, then by g."
+    REMOVED = "<removed-item>"
+
+
+    def __init__(self):
+        self.buckets = []  # buckets[priority][g] is a stack of entries (including outdated ones)
+        self.entries = {}  # Map state key and entry. Used for decrease-key and membership
+        self.min_priority = 0  # No live entry has a lower priority
+
+
+    def __contains__(self, entry_key):
+        return entry_key in self.entries
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def add(self, key, item, priority, g=0):
+        "Add new item under a state key or update the priority of the current one. O(1)."
+        if key in self.entries:
+            self.remove(key)
+        entry = [priority, key, item]
+        self.entries[key] = entry
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+        bucket = self.buckets[priority]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(entry)
+        self.min_priority = min(self.min_priority, priority)
+
+
+    def remove(self, key):
+        "Mark an existing task as REMOVED.  Raise KeyError if not found."
+        outdated_entry = self.entries.pop(key)
+        outdated_entry[-1] = self.REMOVED
+
+
+    def pop(self):
+        "Remove and return the lowest priority item, preferring the highest g among ties. Raise KeyError if empty."
+        while self.entries:
+            bucket = self.buckets[self.min_priority]
+            while bucket and not bucket[-1]:
+                bucket.pop()
+            if not bucket:
+                self.min_priority += 1
+                continue
+            priority, key, item = bucket[-1].pop()
+            if item is not self.REMOVED:
+                del self.entries[key]
+                return item, priority
+        raise KeyError("pop from an empty priority queue")
+
+
+    def get_priority(self, entry_key):
+        "Return priority of existing item. Raise KeyError if not found."
+        return self.entries[entry_key][0]
+
+
+    def get_item(self, entry_key):
+        "Return the item stored under a state key. Raise KeyError if not found."
+        return self.entries[entry_key][-1]
+
+
+OPEN_LISTS = {
+    "heap": PriorityQueue,
+    "bucket": BucketQueue,
+}
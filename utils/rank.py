@@ -0,0 +1,50 @@
+# utils/rank.py
+
+"""Perfect hashing of full board permutations by their Lehmer code.
+
+A packed state is read as the sequence of tiles by position. Its lexicographic
+rank is a unique int in [0, n!) computed in O(n) with one popcount per tile,
+which lets tables and bitmaps store one entry per board instead of hashing.
+"""
+
+from functools import lru_cache
+from math import factorial
+
+from utils.state import tile_bits
+
+
+def permutation_count(size):
+    """Number of boards of this size, i.e. the length of a rank-indexed table."""
+    return factorial(size * size)
+
+
+@lru_cache(maxsize=None)
+def _weights(size):
+    n = size * size
+    return tuple(factorial(n - 1 - i) for i in range(n))
+
+
+def state_rank(state, size):
+    """Lexicographic rank of a packed state. O(n)."""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    rank = 0
+    used = 0  # Bit t is set once tile t has been seen
+    for weight in _weights(size):
+        tile = state & mask
+        # Lehmer digit: smaller tiles not yet used
+        rank += (tile - (used & ((1 << tile) - 1)).bit_count()) * weight
+        used |= 1 << tile
+        state >>= bits
+    return rank
+
+
+def state_unrank(rank, size):
+    """Packed state with this lexicographic rank; inverse of state_rank. O(n^2)."""
+    bits = tile_bits(size)
+    unused = list(range(size * size))
+    state = 0
+    for index, weight in enumerate(_weights(size)):
+        digit, rank = divmod(rank, weight)
+        state |= unused.pop(digit) << (index * bits)
+    return state
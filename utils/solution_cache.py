@@ -0,0 +1,85 @@
+# utils/solution_cache.py
+
+"""Content-addressed cache of solver results.
+
+A result is keyed by a hash of everything that decides it: the puzzle, the
+algorithm, the heuristic, the solver options and SOLVER_VERSION. Recent results
+stay in an in-memory LRU; every result is also written to data/cache/solutions
+so other processes and later runs can reuse it. Entries keep the path as a
+compact move string.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from utils.output_format import expand_output, format_output
+
+CACHE_DIR = os.path.join("data", "cache", "solutions")
+SOLVER_VERSION = 4  # Bump when a solver change alters its results, to retire old entries
+
+# Only finished searches are worth replaying; timeouts and memory failures are retried
+CACHEABLE_STATUSES = {"Path found", "No path"}
+
+
+def solution_key(initial_state, goal_state, size, algorithm, heuristic, options=None):
+    """Hex digest identifying one solver run."""
+    payload = json.dumps({
+        "initial_state": list(initial_state),
+        "goal_state": list(goal_state),
+        "size": size,
+        "algorithm": algorithm,
+        "heuristic": heuristic,
+        "options": options or {},
+        "version": SOLVER_VERSION,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SolutionCache:
+    """In-memory LRU of solver results in front of a directory of JSON files."""
+
+    def __init__(self, directory=CACHE_DIR, capacity=256):
+        self.directory = directory
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # The GUI solves on a background thread
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Cached result for key, or None."""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return expand_output(self.entries[key])
+        try:
+            with open(self._path(key), 'r') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, result)
+        return expand_output(result)
+
+    def put(self, key, result):
+        """Store a finished result in memory and on disk. Other statuses are ignored."""
+        if result.get("status") not in CACHEABLE_STATUSES:
+            return
+        record = format_output(result, compact=True)
+        self._remember(key, record)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _remember(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
@@ -0,0 +1,49 @@
+# utils/state.py
+
+"""Packed integer encoding of puzzle states.
+
+A board is stored as a single int: the tile at index i occupies bits
+[i * bits, (i + 1) * bits), where bits is 4 for boards up to 4x4 and wider
+for bigger boards. The blank is tile 0, so its field is always empty.
+"""
+
+
+def tile_bits(size):
+    """Return the width in bits of one tile field for a size x size board."""
+    return max(4, (size * size - 1).bit_length())
+
+
+def pack(tiles, size):
+    """Pack a flat list of tiles into an int key."""
+    bits = tile_bits(size)
+    key = 0
+    for index, tile in enumerate(tiles):
+        key |= tile << (index * bits)
+    return key
+
+
+def unpack(key, size):
+    """Unpack an int key back into a flat list of tiles."""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    return [(key >> (index * bits)) & mask for index in range(size * size)]
+
+
+def blank_index(key, size):
+    """Return the board index of the blank. Solvers call this once per root and cache the result."""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    for index in range(size * size):
+        if not (key >> (index * bits)) & mask:
+            return index
+    raise ValueError("state has no blank tile")
+
+
+def tile_positions(key, size):
+    """Return a list mapping each tile to its board index."""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    positions = [0] * (size * size)
+    for index in range(size * size):
+        positions[(key >> (index * bits)) & mask] = index
+    return positions
@@ -0,0 +1,34 @@
+# utils/table_io.py
+
+"""Lookup tables cached on disk as raw bytes.
+
+Pattern databases and exhaustive distance tables take seconds to build, so
+each is built once, saved under data/ and memory-mapped on every later load:
+pages are read on demand and shared by the processes of a batch.
+"""
+
+import hashlib
+import mmap
+import os
+
+from utils.state import unpack
+
+
+def goal_digest(goal_state, size):
+    """Short digest of a goal board, pinning it in cache file names."""
+    return hashlib.sha1(bytes(unpack(goal_state, size))).hexdigest()[:12]
+
+
+def load_table(path, build, label):
+    """Memory-map the table cached at path, calling build() and saving the bytes it returns first if missing."""
+    if not os.path.exists(path):
+        print(f"Building {label} {path} ...")
+        table = build()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"  # Per process: pool workers may build the same table at once
+        with open(tmp_path, 'wb') as f:
+            f.write(table)
+        os.replace(tmp_path, path)
+
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
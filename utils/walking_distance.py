@@ -0,0 +1,137 @@
+# utils/walking_distance.py
+
+"""Walking distance heuristic (Takahashi).
+
+Rows and columns are scored independently. For rows, a configuration counts
+how many tiles of each goal row stand in each row, plus the row of the blank;
+only vertical moves change it. The least number of vertical moves between a
+configuration and the goal one is precomputed by BFS once per board size and
+goal blank row, and columns reuse the same table through the transpose.
+"""
+
+from functools import lru_cache
+
+from utils.errors import UnsupportedError
+from utils.state import tile_bits, tile_positions
+
+COUNT_BITS = 3  # A cell of the count matrix holds at most size tiles
+MEMO_LIMIT = 1 << 14  # States whose axis codes are remembered; holds every ancestor of a search branch
+
+
+def _encode(matrix, size):
+    code = 0
+    for r in range(size):
+        for g in range(size):
+            code |= matrix[r][g] << (COUNT_BITS * (r * size + g))
+    return code
+
+
+@lru_cache(maxsize=None)
+def walking_distance_table(size, blank_goal_line):
+    """Map code * size + blank line to the least number of moves along one axis."""
+    goal = [[size if r == g else 0 for g in range(size)] for r in range(size)]
+    goal[blank_goal_line][blank_goal_line] -= 1
+
+    start = _encode(goal, size) * size + blank_goal_line
+    table = {start: 0}
+    layer = [(goal, blank_goal_line)]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for matrix, blank in layer:
+            for line in (blank - 1, blank + 1):
+                if not 0 <= line < size:
+                    continue
+                for g in range(size):
+                    if not matrix[line][g]:
+                        continue
+                    # A tile with goal line g crosses from line into the blank's line
+                    child = [row[:] for row in matrix]
+                    child[line][g] -= 1
+                    child[blank][g] += 1
+                    key = _encode(child, size) * size + line
+                    if key not in table:
+                        table[key] = depth
+                        next_layer.append((child, line))
+        layer = next_layer
+    return table
+
+
+class WalkingDistance:
+    """Row walking distance plus column walking distance."""
+
+    consistent = True  # A move changes one axis configuration to a neighbouring one
+
+    def __init__(self, goal_state, size):
+        if size > 4:
+            raise UnsupportedError("walking distance tables are only supported up to 4x4")
+        self.size = size
+        n = size * size
+        self.bits = tile_bits(size)
+        self.mask = (1 << self.bits) - 1
+        goal_positions = tile_positions(goal_state, size)
+        blank_row, blank_col = divmod(goal_positions[0], size)
+        self.row_table = walking_distance_table(size, blank_row)
+        self.col_table = walking_distance_table(size, blank_col)
+        self.codes = {}  # state -> (row code, column code), for the states scored most recently
+
+        # row_inc[tile * n + pos] is the count-matrix increment of tile standing at pos
+        self.row_inc = [0] * (n * n)
+        self.col_inc = [0] * (n * n)
+        for tile in range(1, n):
+            goal_row, goal_col = divmod(goal_positions[tile], size)
+            for pos in range(n):
+                row, col = divmod(pos, size)
+                self.row_inc[tile * n + pos] = 1 << (COUNT_BITS * (row * size + goal_row))
+                self.col_inc[tile * n + pos] = 1 << (COUNT_BITS * (col * size + goal_col))
+
+    def _code(self, state, inc):
+        n = self.size * self.size
+        bits, mask = self.bits, self.mask
+        code = 0
+        for pos in range(n):
+            tile = (state >> (pos * bits)) & mask
+            if tile:
+                code += inc[tile * n + pos]
+        return code
+
+    def _codes(self, state):
+        """(row code, column code) of state: remembered if it was scored recently, else counted. O(n)."""
+        codes = self.codes.get(state)
+        if codes is None:
+            codes = self._code(state, self.row_inc), self._code(state, self.col_inc)
+            self._remember(state, codes)
+        return codes
+
+    def _remember(self, state, codes):
+        if len(self.codes) >= MEMO_LIMIT:
+            self.codes.clear()
+        self.codes[state] = codes
+
+    def estimate(self, state):
+        blank_row, blank_col = divmod(tile_positions(state, self.size)[0], self.size)
+        size = self.size
+        row_code, col_code = self._codes(state)
+        return self.row_table[row_code * size + blank_row] + self.col_table[col_code * size + blank_col]
+
+    def update(self, h, state, tile, src, dst):
+        """Re-score after tile slid from src to dst. O(1) once the parent's codes are known.
+
+        Searches score a state's children right after scoring the state, so its
+        codes are remembered; the child's code of the axis the move crossed is
+        the parent's plus the moved tile's change alone.
+        """
+        n, size = self.size * self.size, self.size
+        parent = state + tile * ((1 << (src * self.bits)) - (1 << (dst * self.bits)))
+        row_code, col_code = self._codes(parent)
+        # The blank ended up where the tile came from
+        if src // size == dst // size:
+            code = col_code - self.col_inc[tile * n + src] + self.col_inc[tile * n + dst]
+            h += self.col_table[code * size + src % size] - self.col_table[col_code * size + dst % size]
+            self._remember(state, (row_code, code))
+        else:
+            code = row_code - self.row_inc[tile * n + src] + self.row_inc[tile * n + dst]
+            h += self.row_table[code * size + src // size] - self.row_table[row_code * size + dst // size]
+            self._remember(state, (code, col_code))
+        return h